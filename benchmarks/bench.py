@@ -0,0 +1,319 @@
+"""Performance benchmarks for template discovery, rendering and writing.
+
+Usage:
+    python benchmarks/bench.py                      # run, print, write benchmarks/results.json
+    python benchmarks/bench.py --compare benchmarks/baseline.json
+    python benchmarks/bench.py --save-baseline      # overwrite benchmarks/baseline.json
+    python benchmarks/bench.py -k render            # only cases whose name contains "render"
+
+Every case reports the median and minimum of several runs. --compare exits non-zero when a
+case's median is slower than the baseline by more than --tolerance (default 25%).
+
+render_plan/synthetic-10k/pool-cold (the process-pool render path) needs at least two CPUs
+and is skipped otherwise. The stored baseline was recorded on a single CPU, so it has no
+figure for that case; record one on a multi-core machine (--save-baseline) before relying
+on --compare for pool changes.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+# Isolate packs, indexes and caches from the real ~/.project-forge before importing the engine.
+HOME = Path(tempfile.mkdtemp(prefix="forge-bench-home-"))
+os.environ["PROJECT_FORGE_HOME"] = str(HOME)
+
+from project_forge.engine import index as index_mod  # noqa: E402
+from project_forge.engine import render as render_mod  # noqa: E402
+from project_forge.engine.packs import Pack, list_packs  # noqa: E402
+from project_forge.engine.plan import find_templates  # noqa: E402
+from project_forge.engine.render import Template, apply_plan, render_plan  # noqa: E402
+
+HERE = Path(__file__).resolve().parent
+BUILTIN = HERE.parent / "src/project_forge/templates_builtin"
+BASELINE = HERE / "baseline.json"
+RESULTS = HERE / "results.json"
+
+SYNTHETIC_PACKS = 120
+TEMPLATES_PER_PACK = 25
+SYNTHETIC_FILES = 10_000
+
+
+def _builtin_ctx(manifest: dict) -> dict[str, str]:
+    ctx = {k: str(v.get("default", "x")) for k, v in manifest.get("vars", {}).items()}
+    ctx.setdefault("package", "app")
+    return ctx
+
+
+def _make_packs(root: Path) -> list[Pack]:
+    manifest = json.dumps({"schema_version": 1, "vars": {}, "files": [{"src": "README.md.j2"}]})
+    packs = []
+    for p in range(SYNTHETIC_PACKS):
+        pack_dir = root / f"pack{p:03d}"
+        for t in range(TEMPLATES_PER_PACK):
+            tdir = pack_dir / f"tpl-{p:03d}-{t:02d}"
+            tdir.mkdir(parents=True)
+            (tdir / "forge.json").write_text(manifest, encoding="utf-8")
+            (tdir / "README.md.j2").write_text("# {{ name }}\n", encoding="utf-8")
+        packs.append(Pack(name=f"bench{p:03d}", kind="local", path=pack_dir))
+    return packs
+
+
+def _make_big_template(root: Path) -> Template:
+    root.mkdir(parents=True)
+    body = "".join(
+        "# {{ project_name }} module %d\n"
+        "{%% for i in range(3) %%}value_{{ i }} = {{ i * %d }}\n{%% endfor %%}\n" % (n, n)
+        for n in range(4)
+    )
+    files = []
+    for n in range(SYNTHETIC_FILES):
+        rel = f"pkg{n % 50:02d}/mod{n:05d}.py.j2"
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(body + f"ID = {n}\n", encoding="utf-8")
+        files.append({"src": rel, "dst": "src/{{ project_name }}/" + rel})
+    manifest = {"schema_version": 1, "vars": {"project_name": {"default": "big"}}, "files": files}
+    (root / "forge.json").write_text(json.dumps(manifest), encoding="utf-8")
+    return Template(name="synthetic-10k", root=root, manifest=manifest)
+
+
+def _reset_memory_caches() -> None:
+    index_mod._MEMO.clear()
+    render_mod._COMPILED = None
+
+
+def _time(fn: Callable[[], object], repeat: int, setup: Callable[[], object] | None = None) -> dict:
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t0)
+    return {"median_s": statistics.median(runs), "min_s": min(runs), "runs": repeat}
+
+
+def _tmpfs_dir() -> Path | None:
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return Path(tempfile.mkdtemp(prefix="forge-bench-", dir=shm))
+    return None
+
+
+def cases(work: Path, tmpfs: Path | None) -> dict[str, Callable[[], dict]]:
+    out: dict[str, Callable[[], dict]] = {}
+
+    def discovery() -> dict[str, Callable[[], dict]]:
+        packs = _make_packs(work / "packs")
+
+        def cold() -> dict:
+            def setup() -> None:
+                _reset_memory_caches()
+                shutil.rmtree(HOME / "index", ignore_errors=True)
+            return _time(lambda: find_templates(packs), repeat=3, setup=setup)
+
+        def warm_disk() -> dict:
+            find_templates(packs)
+            return _time(lambda: find_templates(packs), repeat=5, setup=_reset_memory_caches)
+
+        def warm_memory() -> dict:
+            find_templates(packs)
+            return _time(lambda: find_templates(packs), repeat=10)
+
+        return {
+            "find_templates/cold": cold,
+            "find_templates/warm_disk": warm_disk,
+            "find_templates/warm_memory": warm_memory,
+        }
+
+    out.update(discovery())
+
+    builtin_packs = list_packs(BUILTIN)
+    for lt in find_templates(builtin_packs[:1]):
+        tpl = Template(name=lt.name, root=lt.root, manifest=lt.manifest)
+        ctx = _builtin_ctx(lt.manifest)
+
+        def builtin(tpl: Template = tpl, ctx: dict = ctx) -> dict:
+            return _time(lambda: render_plan(tpl, work / "out" / tpl.name, ctx), repeat=20)
+
+        out[f"render_plan/builtin/{lt.name}"] = builtin
+
+    big: dict[str, Template] = {}
+
+    def big_template() -> Template:
+        if "tpl" not in big:
+            big["tpl"] = _make_big_template(work / "synthetic")
+        return big["tpl"]
+
+    def render_big_cold() -> dict:
+        tpl = big_template()
+
+        def setup() -> None:
+            _reset_memory_caches()
+            shutil.rmtree(HOME / "cache" / "jinja", ignore_errors=True)
+        # every file compiles from scratch here, so one run is plenty
+        return _time(
+            lambda: render_plan(tpl, work / "big", {"project_name": "big"}), repeat=1, setup=setup
+        )
+
+    def render_big_warm() -> dict:
+        tpl = big_template()
+        render_plan(tpl, work / "big", {"project_name": "big"})
+        return _time(lambda: render_plan(tpl, work / "big", {"project_name": "big"}), repeat=3)
+
+    def render_big_pool_cold() -> dict:
+        cpus = os.cpu_count() or 1
+        if cpus < 2:
+            return {"skipped": "single CPU"}
+        tpl = big_template()
+
+        def setup() -> None:
+            _reset_memory_caches()
+            shutil.rmtree(HOME / "cache" / "jinja", ignore_errors=True)
+        return _time(
+            lambda: render_plan(tpl, work / "big", {"project_name": "big"}, jobs=cpus),
+            repeat=1,
+            setup=setup,
+        )
+
+    out["render_plan/synthetic-10k/cold"] = render_big_cold
+    out["render_plan/synthetic-10k/pool-cold"] = render_big_pool_cold
+    out["render_plan/synthetic-10k/warm"] = render_big_warm
+
+    def apply_to(base: Path | None) -> Callable[[], dict]:
+        def run() -> dict:
+            if base is None:
+                return {"skipped": "no writable tmpfs"}
+            tpl = big_template()
+            ops = render_plan(tpl, base / "proj", {"project_name": "big"})
+            return _time(
+                lambda: apply_plan(ops, force=False, root=base / "proj"),
+                repeat=3,
+                setup=lambda: shutil.rmtree(base / "proj", ignore_errors=True),
+            )
+        return run
+
+    out["apply_plan/synthetic-10k/tmpfs"] = apply_to(tmpfs)
+    out["apply_plan/synthetic-10k/disk"] = apply_to(work / "disk")
+
+    def forge_new(warm: bool) -> Callable[[], dict]:
+        def run() -> dict:
+            home = work / "e2e-home"
+            dest = work / "e2e-out"
+            cmd = [
+                sys.executable, "-c", "from project_forge.cli import app; app()",
+                "new", "python-fastapi", str(dest), "--yes", "--force",
+            ]
+
+            def setup() -> None:
+                shutil.rmtree(dest, ignore_errors=True)
+                if not warm:
+                    shutil.rmtree(home, ignore_errors=True)
+
+            def once() -> None:
+                env = dict(os.environ, PROJECT_FORGE_HOME=str(home))
+                subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, check=True)
+
+            once()  # warm the OS page cache and (for the warm case) forge's caches
+            return _time(once, repeat=5, setup=setup)
+        return run
+
+    out["forge_new/cold"] = forge_new(warm=False)
+    out["forge_new/warm"] = forge_new(warm=True)
+    return out
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, res in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base and "median_s" in res and "skipped" in base:
+            print(f"  {name:45s} no baseline ({base['skipped']}); re-record with --save-baseline")
+            continue
+        if not base or "median_s" not in res or "median_s" not in base:
+            continue
+        ratio = res["median_s"] / base["median_s"] if base["median_s"] else 1.0
+        marker = ""
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            marker = "  <-- REGRESSION"
+        print(
+            f"  {name:45s} {base['median_s'] * 1000:10.2f} ms -> "
+            f"{res['median_s'] * 1000:10.2f} ms  x{ratio:.2f}{marker}"
+        )
+    return regressions
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    ap.add_argument("-k", dest="filter", default="", help="only run cases whose name contains this")
+    ap.add_argument("--output", type=Path, default=RESULTS, help="where to write results JSON")
+    ap.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)")
+    ap.add_argument(
+        "--save-baseline", action="store_true", help=f"also write results to {BASELINE}"
+    )
+    args = ap.parse_args()
+
+    work = Path(tempfile.mkdtemp(prefix="forge-bench-"))
+    tmpfs = _tmpfs_dir()
+    results: dict[str, dict] = {}
+    try:
+        for name, fn in cases(work, tmpfs).items():
+            if args.filter not in name:
+                continue
+            res = fn()
+            results[name] = res
+            if "median_s" in res:
+                print(
+                    f"{name:45s} median {res['median_s'] * 1000:10.2f} ms   "
+                    f"min {res['min_s'] * 1000:10.2f} ms"
+                )
+            else:
+                print(f"{name:45s} {res}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+        shutil.rmtree(HOME, ignore_errors=True)
+        if tmpfs is not None:
+            shutil.rmtree(tmpfs, ignore_errors=True)
+
+    doc = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    args.output.write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+    if args.save_baseline:
+        BASELINE.write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+
+    if args.compare:
+        print(f"\nCompared with {args.compare} (tolerance {args.tolerance:.0%}):")
+        regressions = compare(
+            results, json.loads(args.compare.read_text(encoding="utf-8")), args.tolerance
+        )
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,31 +1,45 @@
 from __future__ import annotations
 
+import os
 import shutil
 import subprocess
 import sys
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Optional
 
 import typer
-from rich.console import Console
-from rich.table import Table
-from rich.tree import Tree
 
-from project_forge.engine.fs import ForgeError
-from project_forge.engine.packs import PACKS_LOCK, add_pack, list_packs, remove_pack
-from project_forge.engine.plan import find_templates, generate
-from project_forge.features import registry as feature_registry, get as get_feature
+# Startup cost matters (the CLI is scripted heavily): rich, jinja2 (via the engine) and the
+# feature modules are imported inside the commands that use them, not here.
+# tests/test_import_time.py keeps it that way.
 
 app = typer.Typer(help="Project Forge: generate production-ready projects from templates.")
 pack_app = typer.Typer(help="Manage template packs.")
 app.add_typer(pack_app, name="pack")
+cache_app = typer.Typer(help="Manage forge's caches.")
+app.add_typer(cache_app, name="cache")
 
-console = Console()
+class _LazyConsole:
+    def __init__(self, stderr: bool = False) -> None:
+        self._stderr = stderr
+        self._console = None
+
+    def __getattr__(self, name: str):
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console(stderr=self._stderr)
+        return getattr(self._console, name)
+
+console = _LazyConsole()
+err_console = _LazyConsole(stderr=True)  # for when stdout carries data (--output-archive -)
 
 def _builtin_root() -> Path:
     return Path(__file__).parent / "templates_builtin"
 
 def _parse_vars(kvs: list[str]) -> dict[str, str]:
+    from project_forge.engine.fs import ForgeError
+
     out: dict[str, str] = {}
     for kv in kvs:
         if "=" not in kv:
@@ -37,58 +51,98 @@ def _parse_vars(kvs: list[str]) -> dict[str, str]:
         out[k] = v
     return out
 
-def _prompt_vars(template_manifest: dict, provided: dict, yes: bool) -> dict:
-    vars_spec = template_manifest.get("vars", {})
-    ctx = dict(provided)
-    for k, spec in vars_spec.items():
-        if k in ctx:
-            continue
-        prompt = k
-        default = ""
-        regex = None
-        if isinstance(spec, dict):
-            prompt = str(spec.get("prompt", k))
-            default = str(spec.get("default", "")) if "default" in spec else ""
-            regex = spec.get("regex")
-        if yes and default != "":
-            val = default
-        elif yes and default == "":
-            raise ForgeError(f"Missing required var '{k}' (provide --var {k}=...)")
-        else:
-            val = typer.prompt(prompt, default=default if default != "" else None)
-        if regex:
-            import re
-            if not re.fullmatch(regex, val):
-                raise ForgeError(f"Var '{k}' did not match regex {regex!r}")
-        ctx[k] = val
-    return ctx
-
-def _print_tree(dest: Path, created: list[str]) -> None:
+def _prompt_vars(template_manifest: dict, provided: dict, yes: bool, err: bool = False) -> dict:
+    from project_forge.engine.plan import resolve_vars
+
+    # err: prompt on stderr when stdout carries data (an archive or an event stream)
+    ask = None
+    if not yes:
+        ask = (
+            _ask_stderr if err else (lambda prompt, default: typer.prompt(prompt, default=default))
+        )
+    return resolve_vars(template_manifest, provided, ask=ask)
+
+def _ask_stderr(prompt: str, default: str | None) -> str:
+    # typer.prompt(err=True) still echoes through input(), i.e. onto stdout
+    while True:
+        sys.stderr.write(f"{prompt} [{default}]: " if default is not None else f"{prompt}: ")
+        sys.stderr.flush()
+        line = sys.stdin.readline()
+        if not line:
+            raise typer.Abort()
+        value = line.rstrip("\n")
+        if value:
+            return value
+        if default is not None:
+            return default
+
+def _print_tree(
+    dest: Path, created: list[str], out=console, labels: dict[str, str] | None = None
+) -> None:
+    from rich.tree import Tree
+
     root_tree = Tree(str(dest))
-    # Build a nested dict structure from created paths
+    # Build a nested dict structure from created paths. They all come from the (resolved)
+    # dest, so a string prefix check is enough; no per-path resolve() syscalls.
+    prefix = str(dest).rstrip(os.sep) + os.sep
     rels = []
     for p in created:
-        try:
-            rels.append(Path(p).resolve().relative_to(dest.resolve()))
-        except Exception:
-            # If outside (shouldn't happen), just show absolute
-            rels.append(Path(p))
-    rels = sorted(rels, key=lambda x: (len(x.parts), str(x)))
+        parts = tuple(p[len(prefix):].split(os.sep)) if p.startswith(prefix) else (p,)
+        rels.append((parts, p))
+    rels.sort(key=lambda x: (len(x[0]), x[0]))
     nodes = {(): root_tree}
 
-    for rel in rels:
+    for parts, p in rels:
         cur = ()
-        for i, part in enumerate(rel.parts):
+        for i, part in enumerate(parts):
             nxt = cur + (part,)
             if nxt not in nodes:
                 parent = nodes[cur]
-                nodes[nxt] = parent.add(part)
+                label = part
+                if labels and p in labels and i == len(parts) - 1:
+                    label = f"{part}  [dim]{labels[p]}[/]"
+                nodes[nxt] = parent.add(label)
             cur = nxt
 
-    console.print(root_tree)
+    out.print(root_tree)
+
+def _print_timings(rec, dest: Path, top: int = 20, out=console) -> None:
+    from rich.table import Table
+
+    phases = rec.phases()
+    total = sum(d for _, d in phases) or 1e-9
+    t = Table(title="Timings")
+    t.add_column("Phase", style="bold")
+    t.add_column("ms", justify="right")
+    t.add_column("%", justify="right")
+    for name, d in phases:
+        t.add_row(name, f"{d * 1000:.2f}", f"{d / total * 100:.0f}")
+    steps = [("jinja import/compile", rec.total("compile")), *rec.phases("step")]
+    for name, d in steps:
+        if d:
+            t.add_row(f"[dim]of which {name}[/]", f"{d * 1000:.2f}", f"{d / total * 100:.0f}")
+    out.print(t)
+
+    files = rec.files()
+    if not files:
+        return
+    slowest = sorted(files.items(), key=lambda kv: -(kv[1]["render"] + kv[1]["write"]))[:top]
+    t = Table(title=f"Slowest files ({len(slowest)} of {len(files)})")
+    t.add_column("File", style="bold")
+    t.add_column("render ms", justify="right")
+    t.add_column("write ms", justify="right")
+    root = str(dest) + "/"
+    for path, d in slowest:
+        rel = path[len(root):] if path.startswith(root) else path
+        t.add_row(rel, f"{d['render'] * 1000:.2f}", f"{d['write'] * 1000:.2f}")
+    out.print(t)
 
 @app.command("list")
 def list_templates() -> None:
+    from rich.table import Table
+    from project_forge.engine.packs import list_packs
+    from project_forge.engine.discover import find_templates
+
     packs = list_packs(_builtin_root())
     templates = find_templates(packs)
     t = Table(title="Templates")
@@ -107,56 +161,360 @@ def new(
     yes: bool = typer.Option(False, "--yes", help="Non-interactive. Use defaults and fail if required vars missing."),
     force: bool = typer.Option(False, "--force", help="Overwrite existing files."),
     dry_run: bool = typer.Option(False, "--dry-run", help="Show what would be written without writing."),
+    details: bool = typer.Option(
+        False,
+        "--details",
+        help="With --dry-run, also render each file and show its size and sha256.",
+    ),
     git: bool = typer.Option(False, "--git", help="Run git init in destination."),
-    output: str = typer.Option("list", "--output", help="Output style: list or tree"),
+    output: str = typer.Option(
+        "list",
+        "--output",
+        help="Output style: list, tree, or ndjson (one JSON event per file, as it happens)",
+    ),
+    stream: bool = typer.Option(
+        False, "--stream", help="Render and write one file at a time (bounded memory)."
+    ),
+    atomic: bool = typer.Option(
+        False,
+        "--atomic",
+        help="Stage all files first and publish with renames; a failure writes nothing.",
+    ),
+    render_jobs: Optional[int] = typer.Option(
+        None,
+        "--render-jobs",
+        help="Render processes (default: automatic for large templates; 1 = in-process).",
+    ),
+    hook_jobs: Optional[int] = typer.Option(
+        None,
+        "--hook-jobs",
+        help="Post-hooks to run at once (default 4); independent hooks run concurrently.",
+    ),
+    output_archive: Optional[str] = typer.Option(
+        None,
+        "--output-archive",
+        help=(
+            "Write the project as a tar.gz or zip to this file ('-' for stdout) instead of to DEST."
+        ),
+    ),
+    archive_format: Optional[str] = typer.Option(
+        None,
+        "--archive-format",
+        help="tar.gz or zip (default: from the file name; tar.gz for stdout).",
+    ),
+    timings: bool = typer.Option(
+        False, "--timings", help="Print a per-phase and per-file timing breakdown."
+    ),
+    trace: Optional[Path] = typer.Option(
+        None, "--trace", help="Write a Chrome/Perfetto trace JSON to this path."
+    ),
 ) -> None:
-    packs = list_packs(_builtin_root())
+    from project_forge.engine.fs import ForgeError, WriteReport
+    from project_forge.engine.packs import list_packs
+    from project_forge.engine.plan import generate, get_template, plan_project
+    from project_forge.engine.trace import Recorder, span
+
+    if output_archive is not None and (dry_run or git or atomic):
+        raise ForgeError("--output-archive cannot be combined with --dry-run, --git or --atomic")
+    if output == "ndjson" and output_archive == "-":
+        raise ForgeError("--output ndjson needs stdout; write the archive to a file instead")
+    out = err_console if output_archive == "-" or output == "ndjson" else console
+    events = None
+    on_write = None
+    if output == "ndjson":
+        from project_forge.engine.events import NdjsonEvents
 
-    # Find template root + manifest for prompting
-    from project_forge.engine.plan import get_template
-    from project_forge.engine.render import load_manifest
-    lt = get_template(template, packs)
-    manifest = load_manifest(lt.root)
+        events = NdjsonEvents(dest.resolve())
+        on_write = events.file
+    rec = Recorder()
+    report = WriteReport()
+    running = events.running() if events is not None else nullcontext()
+    with running, rec if (timings or trace) else nullcontext():
+        with span("discover packs"):
+            packs = list_packs(_builtin_root())
+            # Find template root + manifest for prompting
+            lt = get_template(template, packs)
+        with span("load manifest"):
+            manifest = lt.manifest
 
-    provided = _parse_vars(var)
-    ctx = _prompt_vars(manifest, provided, yes=yes)
-    dest = dest.resolve()
+        provided = _parse_vars(var)
+        with span("prompt vars"):
+            ctx = _prompt_vars(manifest, provided, yes=yes, err=out is err_console)
+        dest = dest.resolve()
 
-    created = generate(template, dest, packs, ctx, force=force, dry_run=dry_run, yes=yes, init_git=git)
+        labels: dict[str, str] = {}
+        if dry_run:
+            # paths only; bodies are rendered just for --details
+            planned = plan_project(lt, dest, packs, ctx)
+            created = [str(p.dst) for p in planned]
+            if events is not None:
+                for p in planned:
+                    events.planned(p.dst, *((p.size(), p.digest()) if details else ()))
+            elif details:
+                with span("render"):
+                    labels = {
+                        str(p.dst): f"{p.size()} B  sha256:{p.digest()[:12]}" for p in planned
+                    }
+        elif output_archive is not None:
+            from project_forge.engine.sink import open_sink
+
+            with open_sink(output_archive, archive_format, prefix=dest.name) as sink:
+                created = generate(
+                    lt,
+                    dest,
+                    packs,
+                    ctx,
+                    force=force,
+                    dry_run=False,
+                    yes=yes,
+                    init_git=False,
+                    report=report,
+                    sink=sink,
+                    on_write=on_write,
+                )
+        else:
+            created = generate(
+                lt,
+                dest,
+                packs,
+                ctx,
+                force=force,
+                dry_run=False,
+                yes=yes,
+                init_git=git,
+                stream=stream,
+                report=report,
+                hook_jobs=hook_jobs,
+                atomic=atomic,
+                render_jobs=render_jobs,
+                on_write=on_write,
+            )
 
-    if dry_run:
-        console.print(f"[yellow]Dry run:[/] would create {len(created)} files")
+    if events is not None:
+        events.summary(
+            dry_run=dry_run,
+            files=len(created),
+            written=report.written,
+            changed=report.changed,
+            skipped=report.skipped,
+        )
+    elif dry_run:
+        out.print(f"[yellow]Dry run:[/] would create {len(created)} files")
+    elif output_archive is not None:
+        where = "stdout" if output_archive == "-" else output_archive
+        out.print(f"[green]Archived {len(created)} files to[/] {where}")
+    elif report.changed or report.skipped:
+        out.print(
+            f"[green]Wrote {len(created)} files in[/] {dest}: {report.written} new, "
+            f"{report.changed} changed, {report.skipped} unchanged"
+        )
     else:
-        console.print(f"[green]Created {len(created)} files in[/] {dest}")
+        out.print(f"[green]Created {len(created)} files in[/] {dest}")
 
     if output == "tree":
-        _print_tree(dest, created)
-    else:
-        for p in created:
-            console.print(f"  - {p}")
+        _print_tree(dest, created, out, labels)
+    elif events is None and created:
+        # one print for the whole list; per-line console.print dominates on large plans
+        out.print(
+            "\n".join(
+                f"  - {p}  [dim]{labels[p]}[/]" if p in labels else f"  - {p}" for p in created
+            )
+        )
+
+    if timings:
+        _print_timings(rec, dest, out=out)
+    if trace:
+        rec.write_chrome_trace(trace)
+        out.print(f"[dim]Trace written to[/] {trace} [dim](open in ui.perfetto.dev)[/]")
+
+@app.command("update")
+def update_project(
+    dest: Path = typer.Argument(..., help="Project generated by forge new"),
+    var: list[str] = typer.Option(
+        [], "--var", help="Change template variables (key=value). Repeatable."
+    ),
+    force: bool = typer.Option(False, "--force", help="Also overwrite files you edited locally."),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Report what would change without writing."
+    ),
+) -> None:
+    from project_forge.engine.packs import list_packs
+    from project_forge.engine.plan import update
+
+    packs = list_packs(_builtin_root())
+    report = update(dest, packs, _parse_vars(var), force=force, dry_run=dry_run)
+
+    verb = "Would update" if dry_run else "Updated"
+    console.print(
+        f"[green]{verb} {len(report.updated)}, added {len(report.added)}[/]; "
+        f"{len(report.unchanged) + len(report.identical)} unchanged"
+    )
+    for rel in report.updated:
+        console.print(f"  [green]M[/] {rel}")
+    for rel in report.added:
+        console.print(f"  [green]A[/] {rel}")
+    for rel in report.conflicts:
+        console.print(f"  [red]C[/] {rel} [dim](edited locally; kept, use --force to overwrite)[/]")
+    for rel in report.orphaned:
+        console.print(f"  [yellow]?[/] {rel} [dim](no longer produced by the template)[/]")
+
+@app.command("batch")
+def batch(
+    spec: Path = typer.Argument(
+        ..., help='JSONL file: one {"template", "dest", "vars"} object per line'
+    ),
+    jobs: Optional[int] = typer.Option(
+        None, "--jobs", "-j", help="Worker processes (default: CPU count)."
+    ),
+    force: bool = typer.Option(False, "--force", help="Overwrite existing files."),
+    yes: bool = typer.Option(
+        False, "--yes", help="Also run post-hooks (they cannot prompt in batch mode)."
+    ),
+    git: bool = typer.Option(False, "--git", help="Run git init in each destination."),
+) -> None:
+    import json
+
+    from rich.table import Table
+    from project_forge.engine.fs import ForgeError
+    from project_forge.engine.packs import list_packs
+    from project_forge.engine.plan import BatchItem, BatchResult, generate_many, get_template
+
+    packs = list_packs(_builtin_root())
+    items: list[BatchItem] = []
+    failed: dict[int, BatchResult] = {}
+    for lineno, line in enumerate(spec.read_text(encoding="utf-8").splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except ValueError as e:
+            raise ForgeError(f"{spec}:{lineno}: invalid JSON ({e})")
+        if not isinstance(entry, dict) or "template" not in entry or "dest" not in entry:
+            raise ForgeError(f"{spec}:{lineno}: expected an object with 'template' and 'dest'")
+        provided = {str(k): str(v) for k, v in (entry.get("vars") or {}).items()}
+        item = BatchItem(
+            template=str(entry["template"]), dest=Path(entry["dest"]).resolve(), ctx=provided
+        )
+        try:
+            manifest = get_template(item.template, packs).manifest
+            item = BatchItem(
+                template=item.template,
+                dest=item.dest,
+                ctx=_prompt_vars(manifest, provided, yes=True),
+            )
+        except ForgeError as e:
+            failed[len(items) + len(failed)] = BatchResult(item=item, ok=False, error=str(e))
+            continue
+        items.append(item)
+
+    done = iter(generate_many(items, packs, force=force, yes=yes, init_git=git, jobs=jobs))
+    results = [failed[i] if i in failed else next(done) for i in range(len(items) + len(failed))]
+
+    t = Table(title="Batch")
+    t.add_column("Status", style="bold")
+    t.add_column("Template")
+    t.add_column("Dest")
+    t.add_column("Files")
+    t.add_column("Error")
+    for r in results:
+        status = "[green]ok[/]" if r.ok else "[red]failed[/]"
+        t.add_row(status, r.item.template, str(r.item.dest), str(len(r.created)), r.error or "")
+    console.print(t)
+    n_failed = sum(1 for r in results if not r.ok)
+    console.print(f"{len(results) - n_failed} succeeded, {n_failed} failed")
+    if n_failed:
+        raise typer.Exit(code=1)
 
 @app.command("features")
 def features() -> None:
+    from rich.table import Table
+    from project_forge.features import index as feature_index
+
     t = Table(title="Features")
     t.add_column("Name", style="bold")
     t.add_column("Description")
-    for f in feature_registry():
-        t.add_row(f.name, f.description)
+    for name, description in feature_index().items():
+        t.add_row(name, description)
     console.print(t)
 
 @app.command("add")
 def add_feature(
-    feature: str = typer.Argument(..., help="Feature name"),
+    feature: list[str] = typer.Argument(
+        ..., help="Feature name(s); several are applied in one pass"
+    ),
     dest: Path = typer.Argument(..., help="Project root"),
     force: bool = typer.Option(False, "--force", help="Overwrite existing files."),
+    output: str = typer.Option(
+        "text", "--output", help="Output style: text or ndjson (one JSON event per file)"
+    ),
+) -> None:
+    from project_forge.features import apply_many
+    from project_forge.features import get as get_feature
+
+    events = None
+    if output == "ndjson":
+        from project_forge.engine.events import NdjsonEvents
+
+        events = NdjsonEvents(dest.resolve())
+    with events.running() if events else nullcontext():
+        chosen = [get_feature(name) for name in feature]
+        if len(chosen) == 1 and (events is None or getattr(chosen[0], "mutate", None) is None):
+            chosen[0].apply(dest.resolve(), force)
+            report = None
+        else:
+            # one in-memory project, one write at the end; nothing is written if any feature fails
+            on_write = events.file if events else None
+            report = apply_many(chosen, dest.resolve(), force, on_write=on_write)
+    if events is not None:
+        fields = (
+            {"written": report.written, "changed": report.changed, "skipped": report.skipped}
+            if report
+            else {}
+        )
+        events.summary(features=[f.name for f in chosen], **fields)
+        return
+    for f in chosen:
+        console.print(f"[green]Applied feature:[/] {f.name}")
+
+@app.command("serve")
+def serve(
+    socket: Optional[Path] = typer.Option(
+        None, "--socket", help="Unix socket path (default: ~/.project-forge/forge.sock)"
+    ),
+    port: Optional[int] = typer.Option(None, "--port", help="Also serve HTTP on 127.0.0.1:PORT"),
+    workers: int = typer.Option(4, "--workers", help="Requests handled at once"),
 ) -> None:
-    f = get_feature(feature)
-    f.apply(dest.resolve(), force)
-    console.print(f"[green]Applied feature:[/] {f.name}")
+    """Keep packs indexed and templates compiled; accept JSON requests over a socket or HTTP."""
+    import time
+
+    from project_forge.engine.packs import APP_DIR
+    from project_forge.engine.serve import ForgeService, start, stop
+
+    sock = socket or (APP_DIR / "forge.sock" if port is None else None)
+    service = ForgeService(_builtin_root(), workers=workers)
+    service.packs()
+    servers = start(service, socket_path=sock, port=port)
+    if sock is not None:
+        console.print(f"[green]Listening on[/] {sock}")
+    if port is not None:
+        http = servers[-1]
+        console.print(f"[green]Listening on[/] http://127.0.0.1:{http.server_address[1]}")
+        console.print(f"[dim]Bearer token for HTTP requests is in[/] {http.token_path}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop(servers)
+        service.close()
 
 @app.command("doctor")
 def doctor() -> None:
     """Check that common tooling exists for running templates."""
+    from rich.table import Table
+    from project_forge.engine.packs import PACKS_LOCK
+
     tools = [
         ("git", ["git", "--version"]),
         ("python", [sys.executable, "--version"]),
@@ -187,6 +545,9 @@ def doctor() -> None:
 
 @pack_app.command("list")
 def pack_list() -> None:
+    from rich.table import Table
+    from project_forge.engine.packs import PACKS_LOCK, list_packs
+
     packs = list_packs(_builtin_root())
     t = Table(title="Packs")
     t.add_column("Name", style="bold")
@@ -205,13 +566,79 @@ def pack_add(
     source: str = typer.Argument(..., help="Local folder path or Git URL"),
     name: Optional[str] = typer.Option(None, "--name", help="Override pack name"),
 ) -> None:
+    from project_forge.engine.packs import add_pack
+
     p = add_pack(source, name=name)
     msg = f"[green]Added pack:[/] {p.name} ({p.kind})"
     if p.commit:
         msg += f" @ {p.commit[:12]}"
     console.print(msg)
 
+@pack_app.command("build")
+def pack_build(
+    source: str = typer.Argument(..., help="Pack folder, or the name of an installed pack"),
+    output: Optional[Path] = typer.Option(
+        None, "--output", "-o", help="Archive path (default: ./<name>.forgepack)"
+    ),
+) -> None:
+    from project_forge.engine.archive import ARCHIVE_SUFFIX, build_archive
+    from project_forge.engine.fs import ForgeError
+    from project_forge.engine.packs import list_packs
+
+    src = Path(source).expanduser()
+    if not src.is_dir():
+        match = [p for p in list_packs(_builtin_root()) if p.name == source and p.kind != "archive"]
+        if not match:
+            raise ForgeError(f"No pack folder or installed pack named '{source}'")
+        src = match[0].path
+    out = output or Path(f"{src.resolve().name}{ARCHIVE_SUFFIX}")
+    stats = build_archive(src, out)
+    console.print(
+        f"[green]Built[/] {out} ({stats['templates']} templates, "
+        f"{stats['files']} files, {stats['bytes']} bytes)"
+    )
+    console.print(f"[dim]Install with:[/] forge pack add {out}")
+
+@pack_app.command("update")
+def pack_update(
+    names: Optional[list[str]] = typer.Argument(
+        None, help="Packs to update (default: all git packs)"
+    ),
+    jobs: Optional[int] = typer.Option(None, "--jobs", "-j", help="Packs to update concurrently"),
+) -> None:
+    from project_forge.engine.packs import update_packs
+
+    results = update_packs(names, jobs=jobs)
+    if not results:
+        console.print("[dim]No git packs to update.[/]")
+        return
+    for r in results:
+        if r.error:
+            console.print(f"[red]failed[/]    {r.name}: {r.error}")
+        elif r.changed:
+            console.print(
+                f"[green]updated[/]   {r.name} {(r.old_commit or '?')[:12]} -> {r.new_commit[:12]}"
+            )
+        else:
+            console.print(f"[dim]unchanged[/] {r.name} @ {(r.new_commit or '')[:12]}")
+    if any(r.error for r in results):
+        raise typer.Exit(code=1)
+
 @pack_app.command("remove")
 def pack_remove(name: str = typer.Argument(..., help="Pack name")) -> None:
+    from project_forge.engine.packs import remove_pack
+
     remove_pack(name)
     console.print(f"[green]Removed pack:[/] {name}")
+
+@cache_app.command("gc")
+def cache_gc() -> None:
+    """Delete pack trees, mirrors and blobs that no installed pack uses."""
+    from project_forge.engine.blobs import gc
+    from project_forge.engine.packs import list_packs
+
+    r = gc(list_packs(_builtin_root()))
+    console.print(
+        f"[green]Freed[/] {r.bytes} bytes: {r.blobs} blobs, {r.trees} pack trees, "
+        f"{r.mirrors} mirrors, {r.other} stale index/ref files"
+    )
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .fs import ForgeError, atomic_file, file_digest
+from .packs import Pack, iter_template_dirs
+
+# Layout: MAGIC, then <QQ> (index offset, index length), then file contents (each distinct
+# blob stored once), then the JSON central index:
+#   {"version": 1, "templates": {name: {"manifest": {...},
+#       "files": {src: {"offset", "size", "sha256", "binary"}}}}}
+MAGIC = b"FORGEPK1"
+HEADER = struct.Struct("<QQ")
+ARCHIVE_VERSION = 1
+ARCHIVE_SUFFIX = ".forgepack"
+
+@dataclass(frozen=True)
+class ArchiveMember:
+    archive: PackArchive
+    template: str
+    src: str
+    offset: int
+    size: int
+    sha256: str
+    binary: bool
+
+    def view(self) -> memoryview:
+        """Zero-copy view of the file contents inside the mapped archive."""
+        return self.archive.view(self.offset, self.size)
+
+    def text(self) -> str:
+        return str(self.view(), "utf-8")
+
+    def __str__(self) -> str:
+        return f"{self.archive.path}:{self.template}/{self.src}"
+
+class PackArchive:
+    """Read-only, memory-mapped view of a file built by build_archive()."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        head = len(MAGIC) + HEADER.size
+        if len(self._map) < head or self._map[: len(MAGIC)] != MAGIC:
+            raise ForgeError(f"Not a forge pack archive: {path}")
+        offset, length = HEADER.unpack_from(self._map, len(MAGIC))
+        raw = self._map[offset : offset + length]
+        # covers every manifest and content hash, so it identifies the archive's contents
+        self.digest = hashlib.sha256(raw).hexdigest()
+        try:
+            index = json.loads(raw)
+        except ValueError as e:
+            raise ForgeError(f"Corrupt pack archive {path}: {e}")
+        if index.get("version") != ARCHIVE_VERSION:
+            raise ForgeError(f"Unsupported pack archive version in {path}")
+        self.templates: dict[str, dict[str, Any]] = index["templates"]
+
+    def view(self, offset: int, size: int) -> memoryview:
+        return memoryview(self._map)[offset : offset + size]
+
+    def manifest(self, template: str) -> dict[str, Any]:
+        return self.templates[template]["manifest"]
+
+    def member(self, template: str, src: str) -> ArchiveMember:
+        info = self.templates[template]["files"].get(src)
+        if info is None:
+            raise ForgeError(f"Missing template file: {self.path}:{template}/{src}")
+        return ArchiveMember(
+            self, template, src, info["offset"], info["size"], info["sha256"], info["binary"]
+        )
+
+# path -> (mtime_ns, size, archive); archives stay mapped for the life of the process
+_OPEN: dict[Path, tuple[int, int, PackArchive]] = {}
+
+def open_archive(path: Path) -> PackArchive:
+    try:
+        st = path.stat()
+    except OSError:
+        raise ForgeError(f"Pack archive not found: {path}")
+    cached = _OPEN.get(path)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+    archive = PackArchive(path)
+    _OPEN[path] = (st.st_mtime_ns, st.st_size, archive)
+    return archive
+
+def is_archive(path: Path) -> bool:
+    return path.suffix == ARCHIVE_SUFFIX and path.is_file()
+
+def source_digest(src: Path | ArchiveMember) -> str:
+    """sha256 of a template source file, precomputed for archive members."""
+    if isinstance(src, ArchiveMember):
+        return src.sha256
+    return file_digest(src)
+
+def _template_roots(pack_dir: Path) -> list[Path]:
+    # same lookup as the pack index: <pack>/templates/*, then <pack>/* (later wins)
+    roots: dict[str, Path] = {}
+    for tdir in iter_template_dirs([Pack(name="build", kind="local", path=pack_dir)]):
+        if not tdir.is_dir():
+            continue
+        for child in sorted(tdir.iterdir()):
+            if child.is_dir() and (child / "forge.json").is_file():
+                roots[child.name] = child
+    return [roots[name] for name in sorted(roots)]
+
+def _looks_binary(data: bytes) -> bool:
+    try:
+        data.decode("utf-8")
+    except UnicodeDecodeError:
+        return True
+    return False
+
+def build_archive(pack_dir: Path, out: Path) -> dict[str, int]:
+    """Pack every template under ``pack_dir`` into one archive.
+
+    Returns template/file/byte counts.
+    """
+    from .render import Template, expand_files, load_manifest
+
+    templates: dict[str, dict[str, Any]] = {}
+    blobs: dict[str, tuple[int, int]] = {}  # sha256 -> (offset, size)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_file(out, binary=True, mode=0o644) as f:
+        f.write(MAGIC + HEADER.pack(0, 0))
+        for root in _template_roots(pack_dir):
+            manifest = load_manifest(root)
+            files: dict[str, dict[str, Any]] = {}
+            tpl = Template(name=root.name, root=root, manifest=manifest)
+            for item in expand_files(tpl):  # include patterns are matched against the folder
+                src = str(item["src"])
+                try:
+                    data = (root / src).read_bytes()
+                except OSError:
+                    raise ForgeError(f"Missing template file: {root / src}")
+                digest = hashlib.sha256(data).hexdigest()
+                if digest not in blobs:
+                    blobs[digest] = (f.tell(), len(data))
+                    f.write(data)
+                offset, size = blobs[digest]
+                files[src] = {
+                    "offset": offset,
+                    "size": size,
+                    "sha256": digest,
+                    "binary": _looks_binary(data),
+                }
+            templates[root.name] = {"manifest": manifest, "files": files}
+        index = json.dumps({"version": ARCHIVE_VERSION, "templates": templates}).encode("utf-8")
+        index_offset = f.tell()
+        f.write(index)
+        f.seek(len(MAGIC))
+        f.write(HEADER.pack(index_offset, len(index)))
+    return {
+        "templates": len(templates),
+        "files": sum(len(t["files"]) for t in templates.values()),
+        "bytes": sum(size for _, size in blobs.values()),
+    }
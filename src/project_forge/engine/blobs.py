@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import stat
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from .fs import atomic_file, file_digest
+from .packs import CACHE_DIR, INDEX_DIR, MIRROR_DIR, Pack, index_path, mirror_path
+
+# Content-addressed store for git pack files. Every regular file in a pack tree is a
+# hardlink to BLOB_DIR/<aa>/<sha256>[x] ("x" marks executables), so identical files across
+# packs and pack versions share one inode: disk and page cache grow with unique content.
+# A blob's link count is its reference count; REFS_DIR/<pack>.json records each tree's
+# path -> [blob key, inode] so unchanged files are not re-hashed on the next update.
+BLOB_DIR = CACHE_DIR / "blobs"
+REFS_DIR = BLOB_DIR / "refs"
+
+def blob_path(key: str) -> Path:
+    return BLOB_DIR / key[:2] / key
+
+def _refs_path(name: str) -> Path:
+    return REFS_DIR / index_path(name).name
+
+def _read_refs(name: str) -> dict[str, list]:
+    try:
+        return json.loads(_refs_path(name).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def _write_refs(name: str, refs: dict[str, list]) -> None:
+    path = _refs_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_file(path) as f:
+        f.write(json.dumps(refs, sort_keys=True))
+
+def store_tree(name: str, root: Path) -> int:
+    """Move the files of pack tree ``root`` into the blob store; returns bytes deduplicated.
+
+    Best effort: on filesystems without hardlinks the tree keeps its own copies.
+    """
+    old = _read_refs(name)
+    refs: dict[str, list] = {}
+    saved = 0
+    for dirpath, dirnames, filenames in os.walk(root):
+        if dirpath == str(root):
+            dirnames[:] = [d for d in dirnames if d != ".git"]
+        for fn in filenames:
+            path = os.path.join(dirpath, fn)
+            st = os.lstat(path)
+            if not stat.S_ISREG(st.st_mode):
+                continue
+            rel = os.path.relpath(path, root)
+            prev = old.get(rel)
+            if prev is not None and prev[1] == st.st_ino and st.st_nlink > 1:
+                refs[rel] = prev  # still linked to its blob
+                continue
+            key = file_digest(Path(path)) + ("x" if st.st_mode & 0o111 else "")
+            blob = blob_path(key)
+            try:
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                os.link(path, blob)  # first copy of this content becomes the blob
+                ino = st.st_ino
+            except FileExistsError:
+                ino = blob.stat().st_ino
+                if ino != st.st_ino:
+                    tmp = f"{path}.{os.getpid()}-{os.urandom(4).hex()}.forge-tmp"
+                    os.link(blob, tmp)
+                    os.replace(tmp, path)
+                    saved += st.st_size
+            except OSError:
+                continue
+            refs[rel] = [key, ino]
+    _write_refs(name, refs)
+    return saved
+
+@dataclass
+class GcReport:
+    blobs: int = 0
+    trees: int = 0
+    mirrors: int = 0
+    other: int = 0  # stale refs and index files
+    bytes: int = 0
+
+def _du(path: Path) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for fn in filenames:
+            st = os.lstat(os.path.join(dirpath, fn))
+            if st.st_nlink == 1:  # shared blobs are only freed by the blob sweep
+                total += st.st_size
+    return total
+
+def gc(packs: Iterable[Pack]) -> GcReport:
+    """Delete cache entries no installed pack uses.
+
+    In order: pack trees, mirrors, refs, indexes, then blobs.
+    """
+    packs = list(packs)
+    report = GcReport()
+    trees = {p.path.resolve() for p in packs if p.kind == "git"}
+    mirrors = {mirror_path(p.source) for p in packs if p.kind == "git" and p.source}
+    names = {_refs_path(p.name).name for p in packs}
+
+    def drop(path: Path) -> None:
+        if path.is_dir():
+            report.bytes += _du(path)
+            shutil.rmtree(path)
+        else:
+            report.bytes += path.stat().st_size
+            path.unlink()
+
+    for d in sorted(CACHE_DIR.glob("gitpack-*")):
+        if d.resolve() not in trees:
+            drop(d)
+            report.trees += 1
+    for d in sorted(MIRROR_DIR.glob("*.git")):
+        if d not in mirrors:
+            drop(d)
+            report.mirrors += 1
+    for f in [*REFS_DIR.glob("*.json"), *INDEX_DIR.glob("*.json")]:
+        if f.name not in names:
+            drop(f)
+            report.other += 1
+
+    # a blob whose only link is the store itself is unreferenced
+    for blob in sorted(BLOB_DIR.glob("??/*")):
+        st = blob.stat()
+        if st.st_nlink == 1:
+            blob.unlink()
+            report.blobs += 1
+            report.bytes += st.st_size
+    return report
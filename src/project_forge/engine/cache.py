@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+import jinja2
+from jinja2.bccache import Bucket, BytecodeCache
+
+from .fs import atomic_file
+from .lru import touch, trim
+from .packs import CACHE_DIR
+
+TEMPLATE_CACHE_DIR = CACHE_DIR / "jinja"
+TEMPLATE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+class TemplateCache(BytecodeCache):
+    """On-disk cache of compiled template code with size-bounded LRU eviction.
+
+    Entries are keyed by the hash of the template source and the Jinja version,
+    so the same body shared by several templates (or packs) compiles once.
+    """
+
+    def __init__(
+        self, directory: Path = TEMPLATE_CACHE_DIR, max_bytes: int = TEMPLATE_CACHE_MAX_BYTES
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._size: int | None = None
+
+    def get_cache_key(self, name: str, filename: str | None = None) -> str:
+        return hashlib.sha256(f"{jinja2.__version__}:{name}".encode("utf-8")).hexdigest()
+
+    def _path(self, bucket: Bucket) -> Path:
+        return self.directory / f"{bucket.key}.jbc"
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        path = self._path(bucket)
+        try:
+            with open(path, "rb") as f:
+                bucket.load_bytecode(f)
+        except OSError:
+            return
+        touch(path)
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        path = self._path(bucket)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with atomic_file(path, binary=True) as f:
+                bucket.write_bytecode(f)
+                size = f.tell()
+        except OSError:
+            # the cache is best effort; a read-only home must not break generation
+            return
+        if self._size is None:
+            self._size = self._scan_size()
+        else:
+            self._size += size
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _entries(self) -> list[os.DirEntry]:
+        try:
+            with os.scandir(self.directory) as it:
+                return [e for e in it if e.name.endswith(".jbc")]
+        except FileNotFoundError:
+            return []
+
+    def _stats(self) -> list[tuple[int, int, str]]:
+        # (mtime, size, path); entries another process evicts meanwhile are skipped
+        items = []
+        for entry in self._entries():
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            items.append((st.st_mtime_ns, st.st_size, entry.path))
+        return items
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._stats())
+
+    def evict(self) -> None:
+        self._size = trim(self._stats(), self.max_bytes, _unlink)
+
+    def clear(self) -> None:
+        for entry in self._entries():
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+        self._size = 0
+
+def _unlink(path: str) -> bool:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass  # evicted by someone else: gone either way
+    except OSError:
+        return False
+    return True
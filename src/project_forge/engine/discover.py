@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .fs import ForgeError
+from .index import entry_files, entry_manifest, pack_index
+from .packs import Pack
+
+if TYPE_CHECKING:
+    from .render import Template
+
+# Template discovery only: `forge list` imports this without the render stack (jinja2,
+# render, state, hooks), which plan.py pulls in for generation.
+
+@dataclass(frozen=True)
+class LocatedTemplate:
+    name: str
+    root: Path
+    pack: Pack
+
+    @property
+    def manifest(self) -> dict[str, Any]:
+        entry = pack_index(self.pack).get(self.name)
+        if entry is None:
+            from .render import load_manifest
+
+            return load_manifest(self.root)
+        return entry_manifest(self.pack, self.name, entry)
+
+    def template(self) -> Template:
+        from .archive import open_archive
+        from .render import Template
+
+        manifest = self.manifest
+        archive = open_archive(self.pack.path) if self.pack.kind == "archive" else None
+        files = None
+        if archive is None and any("include" in item for item in manifest["files"]):
+            entry = pack_index(self.pack).get(self.name)
+            files = entry_files(self.pack, entry) if entry is not None else None
+        return Template(
+            name=self.name, root=self.root, manifest=manifest, archive=archive, files=files
+        )
+
+def template_map(packs: list[Pack]) -> dict[str, LocatedTemplate]:
+    # keep last win (later packs override earlier)
+    found: dict[str, LocatedTemplate] = {}
+    for pack in packs:
+        for name, entry in pack_index(pack).items():
+            found[name] = LocatedTemplate(name=name, root=Path(entry["root"]), pack=pack)
+    return found
+
+def find_templates(packs: list[Pack]) -> list[LocatedTemplate]:
+    return sorted(template_map(packs).values(), key=lambda x: x.name)
+
+def get_template(name: str, packs: list[Pack]) -> LocatedTemplate:
+    for pack in reversed(packs):
+        entry = pack_index(pack).get(name)
+        if entry is not None:
+            return LocatedTemplate(name=name, root=Path(entry["root"]), pack=pack)
+    raise ForgeError(f"Template '{name}' not found. Try: forge list")
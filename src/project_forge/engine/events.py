@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+from .fs import WriteOp, file_digest
+
+class NdjsonEvents:
+    """``--output ndjson``: one JSON object per line, written as each file is planned or written.
+
+    File events are ``{"event": "planned"|"written"|"changed"|"skipped", "path", "size",
+    "sha256", "elapsed"}`` with paths relative to ``root`` and ``elapsed`` in seconds since
+    the command started; the last line is ``{"event": "summary", ...}``, or
+    ``{"event": "error", "error": ...}`` if the command failed. Safe to call from the writer
+    threads.
+    """
+
+    def __init__(self, root: Path, out: TextIO | None = None) -> None:
+        self.root = str(root).rstrip(os.sep) + os.sep
+        self.out = out or sys.stdout
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, **fields: Any) -> None:
+        line = json.dumps(
+            {"event": event, **fields, "elapsed": round(time.perf_counter() - self._t0, 6)}
+        )
+        with self._lock:
+            self.out.write(line + "\n")
+            self.out.flush()
+
+    def rel(self, path: Path | str) -> str:
+        p = str(path)
+        return p[len(self.root) :].replace(os.sep, "/") if p.startswith(self.root) else p
+
+    def planned(self, path: Path | str, size: int | None = None, digest: str | None = None) -> None:
+        fields: dict[str, Any] = {"path": self.rel(path)}
+        if size is not None:
+            fields.update(size=size, sha256=digest)
+        self.emit("planned", **fields)
+
+    def file(
+        self, op: WriteOp, status: str, digest: str | None = None, size: int | None = None
+    ) -> None:
+        """Callback for a finished write (``on_write``).
+
+        ``digest``/``size`` are passed if the writer already has them.
+        """
+        if size is None:
+            size = op.size()
+        if digest is None:
+            digest = op.digest()
+        if digest is None or size is None:
+            # streamed text: the bytes only exist on disk now
+            size, digest = os.stat(op.dst).st_size, file_digest(op.dst)
+        self.emit(status, path=self.rel(op.dst), size=size, sha256=digest)
+
+    def summary(self, **fields: Any) -> None:
+        self.emit("summary", **fields)
+
+    @contextmanager
+    def running(self) -> Iterator[None]:
+        """Run the command body: anything else printed (git, post-hooks, prompts) goes to
+        stderr, and a failure is reported as an ``error`` event before it propagates."""
+        try:
+            with redirect_stdout(sys.stderr):
+                yield
+        except Exception as e:
+            self.emit("error", error=str(e) or type(e).__name__)
+            raise
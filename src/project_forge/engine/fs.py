@@ -1,11 +1,44 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
+from typing import IO, Any, Iterable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+COPY_CHUNK = 1024 * 1024
 
 class ForgeError(RuntimeError):
     pass
 
+@contextmanager
+def atomic_file(path: Path, binary: bool = False, mode: int | None = None) -> Iterator[IO[Any]]:
+    """Write ``path`` through a temporary file next to it that replaces it on success.
+
+    The temporary comes from mkstemp, so concurrent writers (threads or processes) never
+    share one, and on error it is removed with ``path`` left as it was. mkstemp creates it
+    0600; pass ``mode`` for files that are not private to forge.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        if mode is not None:
+            os.fchmod(fd, mode)
+        with open(fd, "wb" if binary else "w", encoding=None if binary else "utf-8") as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
 def safe_join(root: Path, rel: str) -> Path:
     rel_path = Path(rel)
     if rel_path.is_absolute():
@@ -15,12 +48,129 @@ def safe_join(root: Path, rel: str) -> Path:
         raise ForgeError(f"Refusing path traversal: {rel}")
     return combined
 
+def join_under(root: Path, rel: str) -> Path:
+    """Lexical safe_join: no filesystem access per path. ``root`` must already be resolved."""
+    if Path(rel).is_absolute():
+        raise ForgeError(f"Refusing absolute path: {rel}")
+    combined = os.path.normpath(os.path.join(root, rel))
+    root_s = str(root)
+    if combined != root_s and not combined.startswith(root_s.rstrip(os.sep) + os.sep):
+        raise ForgeError(f"Refusing path traversal: {rel}")
+    return Path(combined)
+
 @dataclass(frozen=True)
 class WriteOp:
     dst: Path
-    bytes_data: bytes | None = None
+    bytes_data: bytes | memoryview | None = None
     text_data: str | None = None
     is_binary: bool = False
+    src: Path | None = None  # copy verbatim from this file instead of bytes_data
+    chunks: Iterable[str] | None = None  # streamed text, consumed once by the writer
 
     def describe(self) -> str:
         return str(self.dst)
+
+    def size(self) -> int | None:
+        """Size in bytes of what this op writes; None for streamed text."""
+        if self.src is not None:
+            return os.stat(self.src).st_size
+        if self.bytes_data is not None:
+            return len(self.bytes_data)
+        if self.text_data is not None:
+            return len(self.text_data.encode("utf-8"))
+        return None
+
+    def digest(self) -> str | None:
+        """sha256 of the bytes this op writes; None for streamed text (hash the file instead)."""
+        if self.src is not None:
+            return file_digest(self.src)
+        if self.bytes_data is not None:
+            return hashlib.sha256(self.bytes_data).hexdigest()
+        if self.text_data is not None:
+            return hashlib.sha256(self.text_data.encode("utf-8")).hexdigest()
+        return None
+
+@dataclass
+class WriteReport:
+    written: int = 0  # new files
+    changed: int = 0  # existing files overwritten with different contents
+    skipped: int = 0  # existing files that were already byte-identical
+
+    def add(self, status: str) -> None:
+        setattr(self, status, getattr(self, status) + 1)
+
+def file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(COPY_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+def walk_files(root: Path) -> list[str]:
+    """Sorted POSIX paths (relative to ``root``) of every file below it.
+
+    One scandir per directory.
+    """
+    out: list[str] = []
+    stack = [("", str(root))]
+    while stack:
+        prefix, path = stack.pop()
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name != ".git":
+                        stack.append((f"{prefix}{entry.name}/", entry.path))
+                elif entry.is_file():
+                    out.append(prefix + entry.name)
+    out.sort()
+    return out
+
+def copy_file(src: Path, dst: Path) -> None:
+    """Copy a file without pulling its contents through Python.
+
+    Tries, in order: a reflink clone, copy_file_range, sendfile, and finally a chunked
+    userspace copy. The result never shares an inode with ``src``.
+    """
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        infd, outfd = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(infd).st_size
+        if size == 0 or _reflink(infd, outfd):
+            return
+        done = _kernel_copy(infd, outfd, size)
+        if done < size:
+            fsrc.seek(done)
+            fdst.seek(done)
+            shutil.copyfileobj(fsrc, fdst, COPY_CHUNK)
+
+def _reflink(infd: int, outfd: int) -> bool:
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(outfd, FICLONE, infd)
+    except OSError:
+        return False
+    return True
+
+def _copy_file_range(infd: int, outfd: int, offset: int, count: int) -> int:
+    return os.copy_file_range(infd, outfd, count, offset, offset)
+
+def _sendfile(infd: int, outfd: int, offset: int, count: int) -> int:
+    os.lseek(outfd, offset, os.SEEK_SET)
+    return os.sendfile(outfd, infd, offset, count)
+
+def _kernel_copy(infd: int, outfd: int, size: int) -> int:
+    done = 0
+    for name, fn in (("copy_file_range", _copy_file_range), ("sendfile", _sendfile)):
+        if not hasattr(os, name):
+            continue
+        try:
+            while done < size:
+                n = fn(infd, outfd, done, min(size - done, 1 << 30))
+                if n == 0:
+                    break
+                done += n
+        except OSError:
+            continue  # unsupported here (EXDEV, ENOSYS, EINVAL, ...); try the next one
+        if done >= size:
+            break
+    return done
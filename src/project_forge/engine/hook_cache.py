@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Iterable
+
+from .fs import copy_file, file_digest
+from .lru import touch, trim
+from .packs import CACHE_DIR
+
+HOOK_CACHE_DIR = CACHE_DIR / "hooks"
+HOOK_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+HOOK_CACHE_VERSION = 1
+
+def _copy(src: str, dst: str) -> None:
+    copy_file(Path(src), Path(dst))
+    shutil.copymode(src, dst)  # keep executables (node_modules/.bin, ...) executable
+
+def _copy_path(src: Path, dst: Path) -> None:
+    if src.is_dir() and not src.is_symlink():
+        shutil.copytree(src, dst, symlinks=True, copy_function=_copy, dirs_exist_ok=True)
+    elif src.is_symlink():
+        os.symlink(os.readlink(src), dst)
+    else:
+        _copy(str(src), str(dst))
+
+def _remove(path: Path) -> None:
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    elif path.exists() or path.is_symlink():
+        path.unlink()
+
+def _rmtree(path: Path) -> bool:
+    shutil.rmtree(path, ignore_errors=True)
+    return True
+
+def _tree_size(path: Path) -> int:
+    if not path.is_dir():
+        return path.lstat().st_size
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for fn in filenames:
+            total += os.lstat(os.path.join(dirpath, fn)).st_size
+    return total
+
+class HookCache:
+    """Outputs of post-hooks, keyed by the command and the hashes of its declared inputs.
+
+    Each entry is a directory holding copies of the declared outputs plus ``meta.json``;
+    least recently used entries are evicted once the cache exceeds ``max_bytes``.
+    """
+
+    def __init__(
+        self, directory: Path = HOOK_CACHE_DIR, max_bytes: int = HOOK_CACHE_MAX_BYTES
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def key(self, cmd: list[str], inputs: Iterable[str], dest: Path) -> str:
+        h = hashlib.sha256()
+        # installed dependencies are usually platform specific
+        h.update(
+            json.dumps([HOOK_CACHE_VERSION, sys.platform, platform.machine(), cmd]).encode("utf-8")
+        )
+        files: set[Path] = set()
+        for pattern in inputs:
+            matches = [p for p in dest.glob(pattern) if p.is_file()]
+            if not matches:
+                h.update(f"\0missing:{pattern}".encode("utf-8"))
+            files.update(matches)
+        for path in sorted(files):
+            h.update(f"\0{path.relative_to(dest).as_posix()}\0{file_digest(path)}".encode("utf-8"))
+        return h.hexdigest()
+
+    def restore(self, key: str, dest: Path, outputs: Iterable[str]) -> bool:
+        entry = self.directory / key
+        if not (entry / "meta.json").exists():
+            return False
+        for rel in outputs:
+            cached = entry / "out" / rel
+            if not (cached.exists() or cached.is_symlink()):
+                continue  # the hook did not produce it; keep what the template put there
+            target = dest / rel
+            _remove(target)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            _copy_path(cached, target)
+        touch(entry / "meta.json")
+        return True
+
+    def store(self, key: str, dest: Path, outputs: Iterable[str]) -> None:
+        entry = self.directory / key
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # unique per writer; hidden, so _entries() never sees a half-written entry
+            tmp = Path(tempfile.mkdtemp(dir=self.directory, prefix=f".{key}."))
+        except OSError:
+            return
+        try:
+            for rel in outputs:
+                src = dest / rel
+                if src.exists() or src.is_symlink():
+                    (tmp / "out" / rel).parent.mkdir(parents=True, exist_ok=True)
+                    _copy_path(src, tmp / "out" / rel)
+            size = _tree_size(tmp)
+            (tmp / "meta.json").write_text(json.dumps({"size": size}), encoding="utf-8")
+            _remove(entry)
+            os.replace(tmp, entry)
+        except OSError:
+            # the cache is best effort; a full or read-only disk must not fail the hook
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        self.evict()
+
+    def _entries(self) -> list[tuple[int, int, Path]]:
+        items = []
+        try:
+            it = os.scandir(self.directory)
+        except FileNotFoundError:
+            return []
+        with it:
+            for e in it:
+                if e.name.startswith("."):
+                    continue
+                meta = Path(e.path) / "meta.json"
+                try:
+                    st = meta.stat()
+                    size = json.loads(meta.read_text(encoding="utf-8"))["size"]
+                except (OSError, ValueError, KeyError):
+                    continue
+                items.append((st.st_mtime_ns, size, Path(e.path)))
+        return items
+
+    def evict(self) -> None:
+        trim(self._entries(), self.max_bytes, _rmtree)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -1,12 +1,93 @@
 from __future__ import annotations
 
 import subprocess
-from pathlib import Path
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
 from typing import Any, Mapping
 
 from .fs import ForgeError
 
-def run_post_hooks(manifest: dict[str, Any], dest: Path, ctx: Mapping[str, Any], yes: bool) -> None:
+# post-hooks mostly wait on the network/disk (npm install, go mod download, ...)
+HOOK_JOBS = 4
+
+@dataclass(frozen=True)
+class Hook:
+    name: str
+    cmd: list[str]
+    needs: tuple[str, ...] = ()
+    inputs: tuple[str, ...] = ()  # globs under the project; with outputs, makes the hook cacheable
+    outputs: tuple[str, ...] = ()  # files/dirs the hook produces, restored from cache on a hit
+
+    @property
+    def cacheable(self) -> bool:
+        return bool(self.outputs)
+
+def parse_hooks(post: list[Any]) -> list[Hook]:
+    """Validate ``hooks.post`` entries.
+
+    An entry is either a command (``["npm", "install"]``) or a named hook
+    (``{"name": "deps", "run": [...], "needs": ["git"]}``). Plain commands keep their old
+    meaning: each one runs after the plain command before it. Named hooks only wait for
+    what they list in ``needs``, and may declare ``inputs``/``outputs`` to be cached.
+    """
+    hooks: list[Hook] = []
+    prev_plain: str | None = None
+    for i, entry in enumerate(post, 1):
+        if isinstance(entry, list):
+            name, cmd, needs = f"post-{i}", entry, [prev_plain] if prev_plain else []
+            inputs: list[str] = []
+            outputs: list[str] = []
+            prev_plain = name
+        elif isinstance(entry, dict):
+            name, cmd, needs = entry.get("name"), entry.get("run"), entry.get("needs", [])
+            if not isinstance(name, str) or not name:
+                raise ForgeError("Invalid hook: named hooks need a 'name' string")
+            if not isinstance(needs, list) or not all(isinstance(n, str) for n in needs):
+                raise ForgeError(f"Invalid hook '{name}': 'needs' must be a list of hook names")
+            inputs, outputs = entry.get("inputs", []), entry.get("outputs", [])
+            for key, paths in (("inputs", inputs), ("outputs", outputs)):
+                if not isinstance(paths, list) or not all(_is_relative(p) for p in paths):
+                    raise ForgeError(
+                        f"Invalid hook '{name}': '{key}' must be a list of project-relative paths"
+                    )
+        else:
+            raise ForgeError("Invalid hook command (expected list[str])")
+        if not isinstance(cmd, list) or not cmd or not all(isinstance(c, str) for c in cmd):
+            raise ForgeError("Invalid hook command (expected list[str])")
+        hooks.append(Hook(name, cmd, tuple(needs), tuple(inputs), tuple(outputs)))
+
+    names = [h.name for h in hooks]
+    for h in hooks:
+        if names.count(h.name) > 1:
+            raise ForgeError(f"Duplicate hook name '{h.name}'")
+        for n in h.needs:
+            if n not in names:
+                raise ForgeError(f"Hook '{h.name}' needs unknown hook '{n}'")
+    # reject cycles up front rather than deadlocking the scheduler
+    done: set[str] = set()
+    while len(done) < len(hooks):
+        ready = [h.name for h in hooks if h.name not in done and set(h.needs) <= done]
+        if not ready:
+            cycle = sorted(h.name for h in hooks if h.name not in done)
+            raise ForgeError(f"Hook dependency cycle among: {', '.join(cycle)}")
+        done.update(ready)
+    return hooks
+
+def _is_relative(p: object) -> bool:
+    if not isinstance(p, str) or not p:
+        return False
+    path = PurePosixPath(p)
+    return not path.is_absolute() and ".." not in path.parts
+
+def run_post_hooks(
+    manifest: dict[str, Any],
+    dest: Path,
+    ctx: Mapping[str, Any],
+    yes: bool,
+    jobs: int | None = None,
+) -> None:
     hooks = manifest.get("hooks", {})
     if not hooks:
         return
@@ -15,17 +96,108 @@ def run_post_hooks(manifest: dict[str, Any], dest: Path, ctx: Mapping[str, Any],
         return
 
     # Hooks are intentionally limited to explicit commands.
-    # If not --yes, we require user confirmation per hook.
-    for cmd in post:
-        if not isinstance(cmd, list) or not cmd:
-            raise ForgeError("Invalid hook command (expected list[str])")
-        if not yes:
-            ans = input(f"Run post-hook in {dest}: {' '.join(cmd)} ? [y/N]: ").strip().lower()
+    # If not --yes, we require user confirmation per hook (all asked before any runs);
+    # a declined hook counts as done for the hooks that need it.
+    todo = parse_hooks(post)
+    declined: set[str] = set()
+    if not yes:
+        for h in todo:
+            ans = input(f"Run post-hook in {dest}: {' '.join(h.cmd)} ? [y/N]: ").strip().lower()
             if ans not in ("y", "yes"):
-                continue
-        try:
-            subprocess.run(cmd, cwd=str(dest), check=True)
-        except FileNotFoundError:
-            raise ForgeError(f"Command not found: {cmd[0]}")
-        except subprocess.CalledProcessError as e:
-            raise ForgeError(f"Hook failed: {e}")
+                declined.add(h.name)
+    _run_graph([h for h in todo if h.name not in declined], declined, dest, jobs or HOOK_JOBS)
+
+class _Runner:
+    def __init__(self, dest: Path, prefix: bool) -> None:
+        self.dest = dest
+        self.prefix = prefix
+        self.cancelled = threading.Event()
+        self._procs: dict[str, subprocess.Popen] = {}
+        self._lock = threading.Lock()
+        self._out = threading.Lock()
+
+    def run(self, hook: Hook) -> None:
+        tag = f"[{hook.name}] " if self.prefix else ""
+        key = None
+        if hook.cacheable:
+            from .hook_cache import HookCache
+
+            cache = HookCache()
+            key = cache.key(hook.cmd, hook.inputs, self.dest)
+            if cache.restore(key, self.dest, hook.outputs):
+                self._print(f"{tag}restored {', '.join(hook.outputs)} from cache\n")
+                return
+        self._run(hook, tag)
+        if key is not None and not self.cancelled.is_set():
+            cache.store(key, self.dest, hook.outputs)
+
+    def _print(self, text: str) -> None:
+        with self._out:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+    def _run(self, hook: Hook, tag: str) -> None:
+        with self._lock:
+            if self.cancelled.is_set():
+                return
+            try:
+                proc = subprocess.Popen(
+                    hook.cmd,
+                    cwd=str(self.dest),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                    errors="replace",
+                )
+            except FileNotFoundError:
+                raise ForgeError(f"Command not found: {hook.cmd[0]}")
+            self._procs[hook.name] = proc
+        assert proc.stdout is not None
+        with proc.stdout:
+            for line in proc.stdout:
+                self._print(tag + line)
+        rc = proc.wait()
+        if rc != 0 and not self.cancelled.is_set():
+            raise ForgeError(f"Hook failed: '{hook.name}' ({' '.join(hook.cmd)}) exited with {rc}")
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled.set()
+            for proc in self._procs.values():
+                if proc.poll() is None:
+                    proc.terminate()
+
+def _run_graph(hooks: list[Hook], done: set[str], dest: Path, jobs: int) -> None:
+    """Run hooks as soon as their needs are done, up to ``jobs`` at once.
+
+    Stops all of them on the first failure.
+    """
+    if not hooks:
+        return
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    runner = _Runner(dest, prefix=len(hooks) > 1)
+    pending = {h.name: h for h in hooks}
+    done = set(done)
+    failure: BaseException | None = None
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        running: dict[Any, Hook] = {}
+        while pending or running:
+            if failure is None:
+                ready = [h for h in pending.values() if set(h.needs) <= done]
+                for h in ready[: max(1, jobs) - len(running)]:
+                    del pending[h.name]
+                    running[pool.submit(runner.run, h)] = h
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                h = running.pop(fut)
+                err = fut.exception()
+                if err is None:
+                    done.add(h.name)
+                elif failure is None:
+                    failure = err
+                    runner.cancel()
+    if failure is not None:
+        raise failure
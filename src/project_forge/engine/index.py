@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from .fs import atomic_file, walk_files
+from .packs import Pack, index_path, iter_template_dirs
+
+INDEX_VERSION = 1
+
+# pack -> (signature, entries). A pack is checked against disk once per process (one
+# command); forge serve calls forget() when it reloads packs.
+_MEMO: dict[Pack, tuple[dict[str, Any], dict[str, dict[str, Any]]]] = {}
+
+def forget() -> None:
+    """Drop the in-process index so the next lookup re-checks every pack on disk."""
+    _MEMO.clear()
+
+def _signature(pack: Pack) -> dict[str, Any]:
+    # Git packs are pinned by commit; anything else is checked against the mtimes of the
+    # directories templates live in (adding/removing a template changes them) and of each
+    # template directory (creating forge.json in an existing folder changes only that one).
+    if pack.kind == "git" and pack.commit:
+        return {"version": INDEX_VERSION, "path": str(pack.path), "commit": pack.commit}
+    dirs: dict[str, int] = {}
+    for tdir in iter_template_dirs([pack]):
+        try:
+            dirs[str(tdir)] = tdir.stat().st_mtime_ns
+            with os.scandir(tdir) as it:
+                for child in it:
+                    if child.is_dir():
+                        dirs[child.path] = child.stat().st_mtime_ns
+        except OSError:
+            continue
+    return {"version": INDEX_VERSION, "path": str(pack.path), "dirs": dirs}
+
+def _scan(pack: Pack) -> dict[str, dict[str, Any]]:
+    entries: dict[str, dict[str, Any]] = {}
+    for tdir in iter_template_dirs([pack]):
+        try:
+            it = os.scandir(tdir)
+        except OSError:
+            continue
+        with it:
+            for child in it:
+                if not child.is_dir():
+                    continue
+                root = Path(child.path)
+                try:
+                    mtime_ns = (root / "forge.json").stat().st_mtime_ns
+                except OSError:
+                    continue
+                # forge.json is read and validated on first use (entry_manifest), so a
+                # broken manifest does not hide the template from `forge list`
+                entries[child.name] = {"root": str(root), "mtime_ns": mtime_ns}
+    return entries
+
+def _read(path: Path) -> dict[str, Any] | None:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def _write(path: Path, data: dict[str, Any]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_file(path) as f:
+            f.write(json.dumps(data))
+    except OSError:
+        pass
+
+def _archive_index(pack: Pack) -> dict[str, dict[str, Any]]:
+    # the archive carries its own central index; nothing to scan or persist
+    from .archive import open_archive
+
+    memo = _MEMO.get(pack)
+    if memo is not None:
+        return memo[1]
+    archive = open_archive(pack.path)
+    sig = {"archive": archive.digest}
+    entries = {
+        name: {"root": str(pack.path / name), "manifest": t["manifest"]}
+        for name, t in archive.templates.items()
+    }
+    _MEMO[pack] = (sig, entries)
+    return entries
+
+def pack_index(pack: Pack) -> dict[str, dict[str, Any]]:
+    """Map template name -> {"root", "mtime_ns", "manifest"?} for one pack.
+
+    The pack's signature (git commit, or directory mtimes) is checked on the first call
+    only; later calls in the same process are a dict lookup.
+    """
+    memo = _MEMO.get(pack)
+    if memo is not None:
+        return memo[1]
+    if pack.kind == "archive":
+        return _archive_index(pack)
+    sig = _signature(pack)
+    path = index_path(pack.name)
+    data = _read(path)
+    if data is not None and data.get("signature") == sig:
+        entries = data["templates"]
+    else:
+        entries = _scan(pack)
+        _write(path, {"signature": sig, "templates": entries})
+    _MEMO[pack] = (sig, entries)
+    return entries
+
+def entry_manifest(pack: Pack, name: str, entry: dict[str, Any]) -> dict[str, Any]:
+    """Return the indexed manifest, re-reading forge.json if it changed since indexing."""
+    root = Path(entry["root"])
+    manifest = entry.get("manifest")
+    if pack.kind == "archive":
+        return manifest
+    if pack.kind == "git" and pack.commit and manifest is not None:
+        return manifest
+    try:
+        mtime_ns = (root / "forge.json").stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    if manifest is not None and mtime_ns == entry.get("mtime_ns"):
+        return manifest
+    from .render import load_manifest
+
+    manifest = load_manifest(root)
+    entry["manifest"] = manifest
+    entry["mtime_ns"] = mtime_ns
+    _save(pack)
+    return manifest
+
+def entry_files(pack: Pack, entry: dict[str, Any]) -> list[str] | None:
+    """Every file of a template, walked once per git pack commit and kept in the index.
+
+    Returns None for packs without a fixed revision; their templates are walked on use.
+    """
+    if not (pack.kind == "git" and pack.commit):
+        return None
+    files = entry.get("files")
+    if files is None:
+        files = entry["files"] = walk_files(Path(entry["root"]))
+        _save(pack)
+    return files
+
+def _save(pack: Pack) -> None:
+    # persist what was learned on use (manifests, file lists) under the signature checked
+    sig, entries = _MEMO[pack]
+    _write(index_path(pack.name), {"signature": sig, "templates": entries})
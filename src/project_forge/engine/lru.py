@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+
+# Shared by the on-disk caches (compiled templates, post-hook outputs): an entry's mtime is
+# its last use, and a cache over its limit is trimmed to 3/4 of it, oldest entries first.
+
+def touch(path: Path | str) -> None:
+    """Mark a cache entry as just used."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+def trim(items: Iterable[tuple[int, int, T]], max_bytes: int, remove: Callable[[T], bool]) -> int:
+    """Drop the least recently used of ``(mtime_ns, size, entry)`` items once they exceed
+    ``max_bytes``; returns the size left. ``remove(entry)`` is False if it could not go."""
+    items = sorted(items, key=lambda item: item[0])
+    total = sum(size for _, size, _ in items)
+    if total <= max_bytes:
+        return total
+    target = max_bytes * 3 // 4
+    for _, size, entry in items:
+        if total <= target:
+            break
+        if remove(entry):
+            total -= size
+    return total
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import shutil
@@ -14,11 +15,13 @@ APP_DIR = Path(os.environ.get("PROJECT_FORGE_HOME", Path.home() / ".project-forg
 PACKS_FILE = APP_DIR / "packs.json"
 PACKS_LOCK = APP_DIR / "packs.lock.json"
 CACHE_DIR = APP_DIR / "cache"
+INDEX_DIR = APP_DIR / "index"
+MIRROR_DIR = CACHE_DIR / "mirrors"
 
 @dataclass(frozen=True)
 class Pack:
     name: str
-    kind: str  # "builtin" | "local" | "git"
+    kind: str  # "builtin" | "local" | "git" | "archive"
     path: Path
     source: str | None = None
     commit: str | None = None
@@ -78,28 +81,29 @@ def add_pack(source: str, name: str | None = None) -> Pack:
         _save_state(state)
         return Pack(pack_name, "local", Path(entry["path"]))
 
+    # Archive built by `forge pack build`?
+    if src_path.suffix == ".forgepack" and src_path.is_file():
+        from .archive import open_archive
+
+        pack_name = name or src_path.stem
+        # content id of the archive, recorded like a git commit in lockfile and project state
+        digest = open_archive(src_path.resolve()).digest
+        entry = {
+            "name": pack_name,
+            "kind": "archive",
+            "path": str(src_path.resolve()),
+            "commit": digest,
+        }
+        _upsert(state, entry)
+        _save_state(state)
+        return Pack(pack_name, "archive", Path(entry["path"]), commit=digest)
+
     # Otherwise treat as git url
     pack_name = name or _slug(source)
     dest = CACHE_DIR / f"gitpack-{pack_name}"
-    if dest.exists():
-        shutil.rmtree(dest)
-
-    try:
-        subprocess.run(["git", "clone", "--depth", "1", source, str(dest)], check=True)
-    except FileNotFoundError:
-        raise ForgeError("git not found on PATH (install git or only use local packs)")
-    except subprocess.CalledProcessError as e:
-        raise ForgeError(f"git clone failed: {e}")
-
-    commit = None
-    try:
-        commit = (
-            subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=str(dest))
-            .decode("utf-8")
-            .strip()
-        )
-    except Exception:
-        commit = None
+    mirror = _sync_mirror(source)
+    commit = _checkout(mirror, dest)
+    _store(pack_name, dest)
 
     entry = {
         "name": pack_name,
@@ -112,6 +116,138 @@ def add_pack(source: str, name: str | None = None) -> Pack:
     _save_state(state)
     return Pack(pack_name, "git", dest.resolve(), source=source, commit=commit)
 
+@dataclass(frozen=True)
+class PackUpdate:
+    name: str
+    old_commit: str | None
+    new_commit: str | None
+    error: str | None = None
+
+    @property
+    def changed(self) -> bool:
+        return self.error is None and self.old_commit != self.new_commit
+
+def update_packs(names: Iterable[str] | None = None, jobs: int | None = None) -> list[PackUpdate]:
+    """Fetch git packs into their mirrors and fast-forward the working trees in place.
+
+    Mirrors are fetched concurrently (each source once, even if several packs use it),
+    then working trees are updated concurrently. packs.json and packs.lock.json get the
+    new commits; a failing pack is reported and keeps its old commit.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    state = _load_state()
+    git_packs = [p for p in state.get("packs", []) if p.get("kind") == "git"]
+    if names:
+        wanted = list(names)
+        kinds = {p.get("name"): p.get("kind") for p in state.get("packs", [])}
+        for n in wanted:
+            if n not in kinds:
+                raise ForgeError(f"No pack named '{n}'")
+            if kinds[n] != "git":
+                raise ForgeError(f"Pack '{n}' is not a git pack; only git packs can be updated")
+        git_packs = [p for p in git_packs if p.get("name") in wanted]
+    if not git_packs:
+        return []
+
+    with ThreadPoolExecutor(max_workers=jobs or min(8, len(git_packs))) as pool:
+        sources = sorted({p["source"] for p in git_packs})
+        mirrors: dict[str, Path | ForgeError] = dict(
+            zip(sources, pool.map(_try(_sync_mirror), sources))
+        )
+
+        def update_one(entry: dict) -> PackUpdate:
+            mirror = mirrors[entry["source"]]
+            if isinstance(mirror, ForgeError):
+                return PackUpdate(
+                    entry["name"], entry.get("commit"), entry.get("commit"), str(mirror)
+                )
+            try:
+                commit = _checkout(mirror, Path(entry["path"]))
+                _store(entry["name"], Path(entry["path"]))
+            except ForgeError as e:
+                return PackUpdate(entry["name"], entry.get("commit"), entry.get("commit"), str(e))
+            return PackUpdate(entry["name"], entry.get("commit"), commit)
+
+        results = list(pool.map(update_one, git_packs))
+
+    by_name = {r.name: r for r in results}
+    for entry in git_packs:
+        r = by_name[entry["name"]]
+        if r.error is None:
+            entry["commit"] = r.new_commit
+    _save_state(state)
+    return results
+
+def _try(fn):
+    def call(arg):
+        try:
+            return fn(arg)
+        except ForgeError as e:
+            return e
+    return call
+
+def _git(args: list[str], cwd: Path | None = None) -> str:
+    try:
+        out = subprocess.run(
+            ["git", *args],
+            cwd=str(cwd) if cwd else None,
+            check=True,
+            capture_output=True,
+        )
+    except FileNotFoundError:
+        raise ForgeError("git not found on PATH (install git or only use local packs)")
+    except subprocess.CalledProcessError as e:
+        detail = e.stderr.decode("utf-8", "replace").strip()
+        raise ForgeError(f"git {args[0]} failed: {detail or e}")
+    return out.stdout.decode("utf-8").strip()
+
+def mirror_path(source: str) -> Path:
+    digest = hashlib.sha1(source.encode("utf-8")).hexdigest()[:10]
+    return MIRROR_DIR / f"{_slug(source)}-{digest}.git"
+
+def _sync_mirror(source: str) -> Path:
+    """Create or incrementally fetch the bare mirror of ``source``; shared by all packs using it."""
+    mirror = mirror_path(source)
+    if (mirror / "HEAD").exists():
+        _git(["remote", "update", "--prune"], cwd=mirror)
+        return mirror
+    if mirror.exists():
+        shutil.rmtree(mirror)  # half-finished clone
+    MIRROR_DIR.mkdir(parents=True, exist_ok=True)
+    _git(["clone", "--quiet", "--mirror", source, str(mirror)])
+    # Working trees borrow objects from here (clone --shared), so never let git prune them.
+    _git(["config", "gc.auto", "0"], cwd=mirror)
+    return mirror
+
+def _checkout(mirror: Path, dest: Path) -> str:
+    """Bring ``dest`` to the mirror's HEAD, in place when it already tracks the mirror."""
+    in_place = False
+    if (dest / ".git").exists():
+        try:
+            in_place = Path(_git(["config", "--get", "remote.origin.url"], cwd=dest)) == mirror
+        except ForgeError:
+            in_place = False
+    if not in_place:
+        # missing, or an old standalone clone: re-create it on top of the mirror
+        if dest.exists():
+            shutil.rmtree(dest)
+        _git(["clone", "--quiet", "--shared", str(mirror), str(dest)])
+    else:
+        _git(["fetch", "--quiet", "origin", "HEAD"], cwd=dest)
+        # only files that differ are rewritten
+        _git(["reset", "--quiet", "--hard", "FETCH_HEAD"], cwd=dest)
+        _git(["clean", "-q", "-ffdx"], cwd=dest)
+    return _git(["rev-parse", "HEAD"], cwd=dest)
+
+def _store(name: str, tree: Path) -> None:
+    from .blobs import store_tree
+
+    try:
+        store_tree(name, tree)
+    except OSError:
+        pass  # deduplication is an optimization; the checkout itself is complete
+
 def remove_pack(name: str) -> None:
     state = _load_state()
     packs = state.get("packs", [])
@@ -120,6 +256,7 @@ def remove_pack(name: str) -> None:
         raise ForgeError(f"No pack named '{name}'")
     state["packs"] = new
     _save_state(state)
+    index_path(name).unlink(missing_ok=True)
 
 def _upsert(state: dict, entry: dict) -> None:
     packs = state.setdefault("packs", [])
@@ -129,6 +266,9 @@ def _upsert(state: dict, entry: dict) -> None:
             return
     packs.append(entry)
 
+def index_path(name: str) -> Path:
+    return INDEX_DIR / f"{_slug(name)}.json"
+
 def _slug(s: str) -> str:
     out = []
     for ch in s:
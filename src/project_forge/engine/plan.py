@@ -1,43 +1,92 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import os
+import sys
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Mapping
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Mapping
 
-from .fs import ForgeError
-from .packs import Pack, iter_template_dirs
-from .render import Template, load_manifest, render_plan, apply_plan
+from .archive import source_digest
+from .discover import LocatedTemplate, find_templates, get_template, template_map  # noqa: F401
+from .fs import ForgeError, WriteOp, WriteReport, file_digest
+from .packs import Pack
+from .render import (
+    PlannedFile,
+    apply_plan,
+    env,
+    iter_sources,
+    plan_files,
+    render_entry,
+    render_sources,
+    stream_and_write,
+    stream_entry,
+    warm_template,
+    write_op,
+)
+from .state import (
+    STATE_FILE,
+    ProjectState,
+    file_record,
+    read_state,
+    state_text,
+    vars_of,
+    write_state,
+)
+from .trace import span
 from .hooks import run_post_hooks
 
-@dataclass(frozen=True)
-class LocatedTemplate:
-    name: str
-    root: Path
-    pack: Pack
-
-def find_templates(packs: list[Pack]) -> list[LocatedTemplate]:
-    found: list[LocatedTemplate] = []
-    for pack in packs:
-        for tdir in iter_template_dirs([pack]):
-            if not tdir.exists():
-                continue
-            for child in tdir.iterdir():
-                if child.is_dir() and (child / "forge.json").exists():
-                    found.append(LocatedTemplate(name=child.name, root=child, pack=pack))
-    # keep last win (later packs override earlier)
-    dedup: dict[str, LocatedTemplate] = {}
-    for t in found:
-        dedup[t.name] = t
-    return sorted(dedup.values(), key=lambda x: x.name)
-
-def get_template(name: str, packs: list[Pack]) -> LocatedTemplate:
-    for t in find_templates(packs):
-        if t.name == name:
-            return t
-    raise ForgeError(f"Template '{name}' not found. Try: forge list")
+if TYPE_CHECKING:
+    from .sink import Sink  # tarfile/zipfile are only imported when an archive is written
+
+def _located(template: str | LocatedTemplate, packs: list[Pack]) -> LocatedTemplate:
+    return template if isinstance(template, LocatedTemplate) else get_template(template, packs)
+
+def plan_project(
+    template_name: str | LocatedTemplate, dest: Path, packs: list[Pack], ctx: Mapping[str, Any]
+) -> list[PlannedFile]:
+    """What ``generate`` would write, as a lazy plan: paths now, bodies only if asked for."""
+    with span("resolve template"):
+        lt = _located(template_name, packs)
+    with span("load manifest"):
+        tpl = lt.template()
+    with span("plan"):
+        return plan_files(tpl, dest, ctx)
+
+def resolve_vars(
+    manifest: dict[str, Any],
+    provided: Mapping[str, Any],
+    ask: Callable[[str, str | None], str] | None = None,
+) -> dict[str, Any]:
+    """Fill in template vars from ``provided``, then defaults (or ``ask``), and validate regexes.
+
+    Without ``ask`` a var with no value and no default is an error.
+    """
+    ctx = dict(provided)
+    for k, spec in manifest.get("vars", {}).items():
+        if k in ctx:
+            continue
+        prompt = k
+        default = ""
+        regex = None
+        if isinstance(spec, dict):
+            prompt = str(spec.get("prompt", k))
+            default = str(spec.get("default", "")) if "default" in spec else ""
+            regex = spec.get("regex")
+        if ask is None and default != "":
+            val = default
+        elif ask is None:
+            raise ForgeError(f"Missing required var '{k}' (provide --var {k}=...)")
+        else:
+            val = ask(prompt, default if default != "" else None)
+        if regex:
+            import re
+            if not re.fullmatch(regex, val):
+                raise ForgeError(f"Var '{k}' did not match regex {regex!r}")
+        ctx[k] = val
+    return ctx
 
 def generate(
-    template_name: str,
+    template_name: str | LocatedTemplate,
     dest: Path,
     packs: list[Pack],
     ctx: Mapping[str, Any],
@@ -45,29 +94,273 @@ def generate(
     dry_run: bool,
     yes: bool,
     init_git: bool,
+    hooks: bool = True,
+    stream: bool = False,
+    report: WriteReport | None = None,
+    hook_jobs: int | None = None,
+    atomic: bool = False,
+    render_jobs: int | None = None,
+    sink: Sink | None = None,
+    on_write: Callable[..., None] | None = None,
 ) -> list[str]:
-    lt = get_template(template_name, packs)
-    manifest = load_manifest(lt.root)
-    tpl = Template(name=lt.name, root=lt.root, manifest=manifest)
-    ops = render_plan(tpl, dest, ctx)
+    """Render a template into ``dest`` (or, with ``sink``, into an archive stream).
 
-    created: list[str] = [str(op.dst) for op in ops]
+    With a sink nothing under ``dest`` is touched: ``dest`` only names the project, and
+    git init and post-hooks are skipped since there is no directory to run them in.
+    ``on_write(op, status, digest=None, size=None)`` is called as each file is written.
+    A template already resolved with ``get_template`` can be passed instead of its name.
+    """
+    with span("resolve template"):
+        lt = _located(template_name, packs)
+    with span("load manifest"):
+        tpl = lt.template()
+    manifest = tpl.manifest
 
+    root = dest.resolve()
     if dry_run:
-        return created
+        with span("plan"):
+            return [str(p.dst) for p in plan_files(tpl, dest, ctx)]
+    with span("plan"):
+        sources = list(iter_sources(tpl, dest, ctx))
 
-    dest.mkdir(parents=True, exist_ok=True)
-    apply_plan(ops, force=force)
+    if sink is not None:
+        return _generate_to_sink(lt, sources, root, ctx, sink, report, on_write)
+    state = ProjectState(
+        template=lt.name, pack=lt.pack.name, commit=lt.pack.commit, vars=vars_of(ctx)
+    )
+    ops: list[WriteOp] = []  # kept only by the modes that render the whole plan up front
+    if stream and not atomic:
+        dest.mkdir(parents=True, exist_ok=True)
+        # render and write one file at a time; peak memory is one file (or one chunk), and
+        # nothing but its path and hashes is kept once it is written
+        e = env()
+        created = []
+        written = WriteReport()
+        checked: set[Path] = set()
+
+        def write(op: WriteOp) -> str:
+            return write_op(op, force=force, root=root, checked=checked, traced=False)
+
+        # the "render" and "write" phases are reported per file by stream_and_write
+        for dst, src, mode in sources:
+            op, status = stream_and_write(e, dst, src, mode, ctx, write)
+            written.add(status)
+            if on_write is not None:
+                on_write(op, status)
+            state.files[dst.relative_to(root).as_posix()] = file_record(op, src)
+            created.append(str(dst))
+    else:
+        if atomic:
+            # render everything into a staging area first; publish only if all of it succeeded
+            with span("render"):
+                if stream:
+                    ops = [stream_entry(env(), dst, src, mode, ctx) for dst, src, mode in sources]
+                else:
+                    ops = render_sources(sources, ctx, jobs=render_jobs)
+            with span("write"):
+                written = apply_plan(ops, force=force, root=root, staged=True, on_write=on_write)
+        else:
+            # apply_plan creates dest, so a failed render leaves nothing behind
+            with span("render"):
+                ops = render_sources(sources, ctx, jobs=render_jobs)
+            with span("write"):
+                written = apply_plan(ops, force=force, root=root, on_write=on_write)
+        created = [str(op.dst) for op in ops]
+    if report is not None:
+        report.written, report.changed, report.skipped = (
+            written.written,
+            written.changed,
+            written.skipped,
+        )
+    with span("state file"):
+        for op, (_, src, _) in zip(ops, sources):
+            state.files[op.dst.relative_to(root).as_posix()] = file_record(op, src)
+        write_state(root, state)
 
     if init_git:
-        _git_init(dest)
+        with span("git init"):
+            _git_init(dest)
 
-    run_post_hooks(manifest, dest, ctx, yes=yes)
+    if hooks:
+        with span("post-hooks"):
+            run_post_hooks(manifest, dest, ctx, yes=yes, jobs=hook_jobs)
     return created
 
+def _generate_to_sink(
+    lt: LocatedTemplate,
+    sources: list[tuple[Path, Any, str]],
+    root: Path,
+    ctx: Mapping[str, Any],
+    sink: Sink,
+    report: WriteReport | None,
+    on_write: Callable[..., None] | None,
+) -> list[str]:
+    # one file at a time, like --stream: rendered, added to the archive, then dropped
+    state = ProjectState(
+        template=lt.name, pack=lt.pack.name, commit=lt.pack.commit, vars=vars_of(ctx)
+    )
+    e = env()
+    created = []
+    for dst, src, mode in sources:
+        rel = dst.relative_to(root).as_posix()
+        op, (digest, size) = stream_and_write(e, dst, src, mode, ctx, lambda op: sink.add(rel, op))
+        state.files[rel] = {"hash": digest, "src": source_digest(src)}
+        if on_write is not None:
+            on_write(op, "written", digest, size)
+        created.append(str(dst))
+    with span("state file"):
+        sink.add(STATE_FILE, WriteOp(dst=root / STATE_FILE, text_data=state_text(state)))
+    if report is not None:
+        report.written = len(created)
+    return created
+
+@dataclass
+class UpdateReport:
+    unchanged: list[str] = field(default_factory=list)  # inputs and file untouched; not re-rendered
+    # re-rendered to the same bytes; not rewritten
+    identical: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    added: list[str] = field(default_factory=list)
+    conflicts: list[str] = field(default_factory=list)  # edited locally and changed upstream; kept
+    orphaned: list[str] = field(default_factory=list)  # no longer produced by the template; kept
+
+def update(
+    dest: Path,
+    packs: list[Pack],
+    overrides: Mapping[str, Any] | None = None,
+    force: bool = False,
+    dry_run: bool = False,
+) -> UpdateReport:
+    """Re-render a generated project from its state file, touching only files that changed.
+
+    A file is skipped without rendering when its source, the vars and the file on disk all
+    match the recorded state. Files edited locally are reported as conflicts and left alone
+    unless ``force``.
+    """
+    root = dest.resolve()
+    old = read_state(root)
+    if old is None:
+        raise ForgeError(f"No {root / '.forge/state.json'} (was this project generated by forge?)")
+    ctx = {**old.vars, **(overrides or {})}
+    same_vars = vars_of(ctx) == old.vars
+
+    lt = get_template(old.template, packs)
+    tpl = lt.template()
+    new = ProjectState(
+        template=lt.name, pack=lt.pack.name, commit=lt.pack.commit, vars=vars_of(ctx)
+    )
+    report = UpdateReport()
+    e = env()
+    writes = []
+
+    for dst, src, mode in iter_sources(tpl, root, ctx):
+        rel = dst.relative_to(root).as_posix()
+        rec = old.files.get(rel)
+        current = file_digest(dst) if dst.is_file() else None
+        src_hash = source_digest(src)
+        if same_vars and rec is not None and rec["src"] == src_hash and current == rec["hash"]:
+            report.unchanged.append(rel)
+            new.files[rel] = rec
+            continue
+
+        op = render_entry(e, dst, src, mode, ctx)
+        digest = src_hash if op.src == src else op.digest()
+        if current == digest:
+            report.identical.append(rel)
+        elif current is None:
+            report.added.append(rel)
+            writes.append(op)
+        elif force or (rec is not None and current == rec["hash"]):
+            report.updated.append(rel)
+            writes.append(op)
+        else:
+            report.conflicts.append(rel)
+            if rec is not None:
+                new.files[rel] = rec  # keep reporting it until resolved
+            continue
+        new.files[rel] = {"hash": digest, "src": src_hash}
+
+    report.orphaned = sorted(set(old.files) - set(new.files) - set(report.conflicts))
+    if not dry_run:
+        apply_plan(writes, force=True, root=root)
+        write_state(root, new)
+    return report
+
+@dataclass(frozen=True)
+class BatchItem:
+    template: str
+    dest: Path
+    ctx: Mapping[str, Any] = field(default_factory=dict)
+
+@dataclass(frozen=True)
+class BatchResult:
+    item: BatchItem
+    ok: bool
+    created: list[str] = field(default_factory=list)
+    error: str | None = None
+
+def generate_many(
+    items: Iterable[BatchItem],
+    packs: list[Pack],
+    force: bool,
+    yes: bool,
+    init_git: bool = False,
+    jobs: int | None = None,
+) -> list[BatchResult]:
+    """Generate several projects with one resolved pack set, spread over a process pool.
+
+    Post-hooks only run with ``yes`` (workers cannot prompt). Results come back in input
+    order; a failing project does not stop the others.
+    """
+    items = list(items)
+    if not items:
+        return []
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(items)))
+
+    # Compile every template used once up front: forked workers inherit the compiled
+    # templates, spawned ones load them from the on-disk cache.
+    for name in sorted({it.template for it in items}):
+        try:
+            lt = get_template(name, packs)
+            warm_template(lt.template())
+        except Exception:
+            continue  # reported per project below
+
+    args = [(it, packs, force, yes, init_git) for it in items]
+    if jobs == 1:
+        return [_generate_one(*a) for a in args]
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_generate_one, *zip(*args)))
+
+def _generate_one(
+    item: BatchItem, packs: list[Pack], force: bool, yes: bool, init_git: bool
+) -> BatchResult:
+    try:
+        created = generate(
+            item.template,
+            Path(item.dest),
+            packs,
+            item.ctx,
+            force=force,
+            dry_run=False,
+            yes=yes,
+            init_git=init_git,
+            hooks=yes,
+            render_jobs=1,  # already one project per worker process
+        )
+    except Exception as e:
+        return BatchResult(item=item, ok=False, error=f"{type(e).__name__}: {e}")
+    return BatchResult(item=item, ok=True, created=created)
+
 def _git_init(dest: Path) -> None:
     import subprocess
     try:
-        subprocess.run(["git", "init"], cwd=str(dest), check=True)
+        # through sys.stdout rather than fd 1, so callers can redirect it (--output ndjson)
+        proc = subprocess.run(
+            ["git", "init"], cwd=str(dest), check=True, stdout=subprocess.PIPE, text=True
+        )
     except FileNotFoundError:
         raise ForgeError("git not found (install git or omit --git)")
+    sys.stdout.write(proc.stdout)
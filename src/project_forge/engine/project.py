@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable
+
+from .fs import ForgeError, WriteOp, WriteReport, join_under
+
+class Project:
+    """In-memory view of a project's files, shared by features applied in one pass.
+
+    Files are read from disk at most once; changes stay in memory until ``flush()``
+    writes them all as one plan, so a feature that fails leaves the disk untouched.
+    """
+
+    def __init__(self, root: Path, force: bool = False) -> None:
+        self.root = root.resolve()
+        self.force = force
+        # rel -> text as last read or written (None: missing)
+        self._files: dict[str, str | None] = {}
+        self._dirty: set[str] = set()
+
+    def path(self, rel: str) -> Path:
+        return join_under(self.root, rel)
+
+    def _load(self, rel: str) -> str | None:
+        if rel not in self._files:
+            try:
+                self._files[rel] = self.path(rel).read_text(encoding="utf-8")
+            except FileNotFoundError:
+                self._files[rel] = None
+        return self._files[rel]
+
+    def exists(self, rel: str) -> bool:
+        return self._load(rel) is not None
+
+    def read_text(self, rel: str) -> str:
+        text = self._load(rel)
+        if text is None:
+            raise ForgeError(f"Missing file: {self.path(rel)}")
+        return text
+
+    def write_text(self, rel: str, text: str) -> None:
+        """Replace (or create) a file; use ``create`` for files a feature owns outright."""
+        self._load(rel)
+        self._files[rel] = text
+        self._dirty.add(rel)
+
+    def create(self, rel: str, text: str) -> None:
+        """Add a new file; an existing one (on disk or from an earlier feature) needs ``force``."""
+        if self.exists(rel) and not self.force:
+            raise ForgeError(f"File exists: {self.path(rel)} (use --force)")
+        self.write_text(rel, text)
+
+    def ops(self) -> list[WriteOp]:
+        return [
+            WriteOp(dst=self.path(rel), text_data=self._files[rel]) for rel in sorted(self._dirty)
+        ]
+
+    def flush(self, on_write: Callable[..., None] | None = None) -> WriteReport:
+        from .render import apply_plan
+
+        report = apply_plan(self.ops(), force=True, root=self.root, on_write=on_write)
+        self._dirty.clear()
+        return report
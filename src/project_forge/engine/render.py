@@ -1,19 +1,55 @@
 from __future__ import annotations
 
+import codecs
+import hashlib
 import json
-from dataclasses import dataclass
+import os
+import pickle
+import re
+import shutil
+import stat
+import time
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Mapping
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Mapping, TypeVar, Union
 
-from jinja2 import Environment, StrictUndefined
+from .archive import ArchiveMember, PackArchive
+from .fs import ForgeError, WriteOp, WriteReport, copy_file, file_digest, join_under, walk_files
+from .trace import listening, record, span
 
-from .fs import ForgeError, WriteOp, safe_join
+if TYPE_CHECKING:
+    from jinja2 import Environment
+    from jinja2 import Template as JinjaTemplate
+
+T = TypeVar("T")
+
+# jinja2 is imported on first use so template discovery (`forge list`) does not pay for it.
+# _COMPILED holds compiled templates shared by every render in this process (a jinja2 LRUCache).
+_COMPILED: Any = None
+
+STREAM_CHUNK = 1024 * 1024
+
+# render_plan spreads text files over a process pool once there are at least this many
+# of them and their sources add up to this many bytes (smaller plans render faster in-process)
+RENDER_POOL_MIN_FILES = 64
+RENDER_POOL_MIN_BYTES = 1024 * 1024
+
+# apply_plan writes from a thread pool once a plan has at least this many files
+PARALLEL_WRITE_MIN = 16
+WRITE_JOBS = min(32, (os.cpu_count() or 1) + 4)
 
 @dataclass(frozen=True)
 class Template:
     name: str
     root: Path
     manifest: dict[str, Any]
+    archive: PackArchive | None = None  # set for templates read from a `forge pack build` archive
+    # every file in the template, if already known (for include patterns)
+    files: list[str] | None = None
+
+# a template file on disk, or inside a mapped pack archive
+Source = Union[Path, ArchiveMember]
 
 def load_manifest(template_root: Path) -> dict[str, Any]:
     mpath = template_root / "forge.json"
@@ -26,63 +62,660 @@ def load_manifest(template_root: Path) -> dict[str, Any]:
         raise ForgeError("Manifest must include a 'files' list")
     if "vars" in manifest and not isinstance(manifest["vars"], dict):
         raise ForgeError("'vars' must be an object")
+    for item in manifest["files"]:
+        if not isinstance(item, dict) or not ("src" in item or "include" in item):
+            raise ForgeError("Each 'files' entry needs 'src' or 'include'")
     return manifest
 
+@lru_cache(maxsize=1)
 def env() -> Environment:
+    with span("jinja import", "compile"):
+        from jinja2 import Environment, StrictUndefined
+
+        from .cache import TemplateCache
+
     # StrictUndefined catches missing vars (professional UX)
-    return Environment(undefined=StrictUndefined, autoescape=False, keep_trailing_newline=True)
+    return Environment(
+        undefined=StrictUndefined,
+        autoescape=False,
+        keep_trailing_newline=True,
+        bytecode_cache=TemplateCache(),
+    )
+
+def _compiled_cache() -> Any:
+    global _COMPILED
+    if _COMPILED is None:
+        from jinja2.utils import LRUCache
+        _COMPILED = LRUCache(512)
+    return _COMPILED
+
+def compile_template(e: Environment, source: str) -> JinjaTemplate:
+    compiled = _compiled_cache()
+    key = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    tmpl = compiled.get(key)
+    if tmpl is not None:
+        return tmpl
+    bcc = e.bytecode_cache
+    if bcc is None:
+        tmpl = e.from_string(source)
+    else:
+        # Same path Jinja uses for loader templates, minus the loader:
+        # a warm cache skips parsing and compilation entirely.
+        with span("compile", "compile", key=key[:12]):
+            bucket = bcc.get_bucket(e, key, None, source)
+            if bucket.code is None:
+                bucket.code = e.compile(source)
+                bcc.set_bucket(bucket)
+            tmpl = e.template_class.from_code(e, bucket.code, e.make_globals(None))
+    compiled[key] = tmpl
+    return tmpl
+
+def render_string(e: Environment, source: str, ctx: Mapping[str, Any]) -> str:
+    if "{" not in source:
+        # no Jinja syntax at all (common for dst paths)
+        return source
+    return compile_template(e, source).render(**ctx)
 
-def render_plan(tpl: Template, dest: Path, ctx: Mapping[str, Any]) -> list[WriteOp]:
+def warm_template(tpl: Template) -> None:
+    """Compile every text file of a template ahead of rendering (fills both caches)."""
     e = env()
-    ops: list[WriteOp] = []
+    for item in expand_files(tpl):
+        if str(item.get("mode", "text")) == "binary":
+            continue
+        try:
+            text = _read_text(_source(tpl, str(item["src"])))
+        except (ForgeError, OSError, UnicodeDecodeError):
+            continue
+        compile_template(e, text)
+
+@lru_cache(maxsize=256)
+def _glob_re(pattern: str) -> re.Pattern[str]:
+    # "**/" spans any number of directories, "*" and "?" stay within one path segment
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out))
+
+def _glob_base(pattern: str) -> str:
+    """Leading directories of a pattern that contain no wildcard.
+
+    "assets/img/*.png" -> "assets/img/"
+    """
+    parts = pattern.split("/")
+    base = []
+    for part in parts[:-1]:
+        if "*" in part or "?" in part:
+            break
+        base.append(part)
+    return "".join(f"{p}/" for p in base)
+
+def _patterns(value: Any) -> list[str]:
+    return [value] if isinstance(value, str) else [str(v) for v in value]
+
+def template_files(tpl: Template) -> list[str]:
+    if tpl.files is not None:
+        return tpl.files
+    if tpl.archive is not None:
+        return sorted(tpl.archive.templates[tpl.name]["files"])
+    return walk_files(tpl.root)
+
+def expand_files(tpl: Template) -> list[dict[str, Any]]:
+    """Manifest ``files`` with every ``include`` entry replaced by one entry per matching file.
+
+    Expanded entries carry ``path`` (the file's path in the template) and ``rel`` (its
+    path below the pattern's fixed leading directories) for use in ``dst``.
+    """
+    items = tpl.manifest["files"]
+    if not any("include" in item for item in items):
+        return items
+    listing = template_files(tpl)
+    out: list[dict[str, Any]] = []
+    for item in items:
+        if "include" not in item:
+            out.append(item)
+            continue
+        matched: dict[str, str] = {}
+        for pattern in _patterns(item["include"]):
+            base, rx = _glob_base(pattern), _glob_re(pattern)
+            for path in listing:
+                if path.startswith(base) and path not in matched and rx.fullmatch(path):
+                    matched[path] = path[len(base):]
+        excludes = [_glob_re(p) for p in _patterns(item.get("exclude", []))]
+        for path in sorted(matched):
+            if path == "forge.json" or any(rx.fullmatch(path) for rx in excludes):
+                continue
+            out.append(
+                {
+                    "src": path,
+                    "dst": item.get("dst", path),
+                    "mode": item.get("mode", "text"),
+                    "_vars": {"path": path, "rel": matched[path]},
+                }
+            )
+    return out
 
-    for item in tpl.manifest["files"]:
+def _source(tpl: Template, src: str, listed: bool = False) -> Source:
+    if tpl.archive is not None:
+        return tpl.archive.member(tpl.name, src)
+    src_path = tpl.root / src
+    if not listed and not src_path.exists():
+        raise ForgeError(f"Missing template file: {src_path}")
+    return src_path
+
+def _read_text(src: Source) -> str:
+    if isinstance(src, ArchiveMember):
+        return src.text()
+    return src.read_bytes().decode("utf-8")
+
+def _is_text(src: Source) -> bool:
+    if isinstance(src, ArchiveMember):
+        return not src.binary  # classified when the archive was built
+    return _is_utf8(src)
+
+def _binary_op(dst_path: Path, src: Source) -> WriteOp:
+    if isinstance(src, ArchiveMember):
+        # a view into the mapped archive: no read, no copy until the writer's write()
+        return WriteOp(dst=dst_path, bytes_data=src.view(), is_binary=True)
+    # copied verbatim by the writer; the payload never enters Python memory
+    return WriteOp(dst=dst_path, src=src, is_binary=True)
+
+def iter_sources(
+    tpl: Template, dest: Path, ctx: Mapping[str, Any]
+) -> Iterator[tuple[Path, Source, str]]:
+    """Yield (dst_path, src_path, mode) for every manifest entry, in manifest order."""
+    e = env()
+    root = dest.resolve()  # once; every destination is then checked lexically
+    for item in expand_files(tpl):
         src = str(item["src"])
         dst_tmpl = str(item.get("dst", src))
         mode = str(item.get("mode", "text"))  # text | binary | auto
+        extra = item.get("_vars")
 
         # destination path can use jinja
-        dst_rel = e.from_string(dst_tmpl).render(**ctx)
+        dst_rel = render_string(e, dst_tmpl, {**ctx, **extra} if extra else ctx)
         if dst_rel.endswith(".j2"):
             dst_rel = dst_rel[:-3]
 
-        dst_path = safe_join(dest, dst_rel)
-        src_path = tpl.root / src
-        if not src_path.exists():
-            raise ForgeError(f"Missing template file: {src_path}")
+        # files found by an include pattern are known to exist
+        yield join_under(root, dst_rel), _source(tpl, src, listed=extra is not None), mode
 
-        raw = src_path.read_bytes()
+@dataclass
+class PlannedFile:
+    """One file of a lazy plan.
 
-        if mode == "binary":
-            ops.append(WriteOp(dst=dst_path, bytes_data=raw, is_binary=True))
-            continue
+    The destination is known up front; the body is rendered on first use.
+    """
 
-        if mode == "auto":
-            # simple heuristic: if it decodes, treat as text, else binary
-            try:
-                raw.decode("utf-8")
-                mode = "text"
-            except UnicodeDecodeError:
-                mode = "binary"
+    dst: Path
+    src: Source
+    mode: str
+    ctx: Mapping[str, Any] = field(repr=False)
+    _op: WriteOp | None = field(default=None, repr=False)
 
-        if mode == "binary":
-            ops.append(WriteOp(dst=dst_path, bytes_data=raw, is_binary=True))
-            continue
+    def op(self) -> WriteOp:
+        if self._op is None:
+            self._op = render_entry(env(), self.dst, self.src, self.mode, self.ctx)
+        return self._op
+
+    def size(self) -> int:
+        size = self.op().size()
+        assert size is not None  # render_entry never streams
+        return size
+
+    def digest(self) -> str:
+        digest = self.op().digest()
+        assert digest is not None
+        return digest
+
+def plan_files(tpl: Template, dest: Path, ctx: Mapping[str, Any]) -> list[PlannedFile]:
+    """Every destination of ``tpl`` without reading or rendering any template body."""
+    return [PlannedFile(dst, src, mode, ctx) for dst, src, mode in iter_sources(tpl, dest, ctx)]
+
+def render_entry(
+    e: Environment, dst_path: Path, src_path: Source, mode: str, ctx: Mapping[str, Any]
+) -> WriteOp:
+    with span(str(dst_path), "render"):
+        return _render_entry(e, dst_path, src_path, mode, ctx)
 
-        text = raw.decode("utf-8")
-        out = e.from_string(text).render(**ctx)
-        ops.append(WriteOp(dst=dst_path, text_data=out, is_binary=False))
+def _render_entry(
+    e: Environment, dst_path: Path, src_path: Source, mode: str, ctx: Mapping[str, Any]
+) -> WriteOp:
+    if mode == "auto":
+        # simple heuristic: if it decodes, treat as text, else binary
+        mode = "text" if _is_text(src_path) else "binary"
 
+    if mode == "binary":
+        return _binary_op(dst_path, src_path)
+
+    text = _read_text(src_path)
+    out = compile_template(e, text).render(**ctx)
+    return WriteOp(dst=dst_path, text_data=out, is_binary=False)
+
+def render_plan(
+    tpl: Template, dest: Path, ctx: Mapping[str, Any], jobs: int | None = None
+) -> list[WriteOp]:
+    return render_sources(list(iter_sources(tpl, dest, ctx)), ctx, jobs=jobs)
+
+def render_sources(
+    sources: list[tuple[Path, Source, str]], ctx: Mapping[str, Any], jobs: int | None = None
+) -> list[WriteOp]:
+    """Render (dst, src, mode) entries in order, in-process or across a process pool.
+
+    ``jobs=None`` picks the pool only for large plans on multi-core machines; ``jobs=1``
+    always renders in-process. Ops come back in input order and the first failing file
+    (in that order) raises the same exception the serial path would.
+    """
+    remote = [i for i, (_, _, mode) in enumerate(sources) if mode != "binary"]
+    workers = _render_workers(sources, remote, jobs)
+    e = env()
+    if workers <= 1:
+        return [render_entry(e, dst, src, mode, ctx) for dst, src, mode in sources]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    tasks = [(i, _source_ref(sources[i][1]), sources[i][2]) for i in remote]
+    results: dict[int, tuple[str, Any]] = {}
+    with span("render pool", "step", files=len(tasks), workers=workers):
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_render_worker, initargs=(dict(ctx),)
+        ) as pool:
+            chunk = max(1, len(tasks) // (workers * 4))
+            for i, kind, value in pool.map(_render_task, tasks, chunksize=chunk):
+                results[i] = (kind, value)
+
+    ops = []
+    for i, (dst, src, mode) in enumerate(sources):
+        kind, value = results.get(i, ("binary", None))
+        if kind == "error":
+            raise value
+        if kind == "binary":
+            ops.append(_binary_op(dst, src))
+        else:
+            ops.append(WriteOp(dst=dst, text_data=value, is_binary=False))
     return ops
 
-def apply_plan(ops: list[WriteOp], force: bool) -> None:
-    for op in ops:
-        op.dst.parent.mkdir(parents=True, exist_ok=True)
-        if op.dst.exists() and not force:
-            raise ForgeError(f"File exists: {op.dst} (use --force)")
-        if op.is_binary:
-            assert op.bytes_data is not None
-            op.dst.write_bytes(op.bytes_data)
+def _render_workers(
+    sources: list[tuple[Path, Source, str]], remote: list[int], jobs: int | None
+) -> int:
+    if jobs is not None:
+        return min(jobs, len(remote))
+    cpus = os.cpu_count() or 1
+    if cpus <= 1 or len(remote) < RENDER_POOL_MIN_FILES:
+        return 1
+    total = 0
+    for i in remote:
+        src = sources[i][1]
+        total += src.size if isinstance(src, ArchiveMember) else os.stat(src).st_size
+        if total >= RENDER_POOL_MIN_BYTES:
+            return min(cpus, len(remote))
+    return 1
+
+def _source_ref(src: Source) -> str | tuple[str, str, str]:
+    # mapped archives cannot be pickled; workers reopen them by path
+    if isinstance(src, ArchiveMember):
+        return (str(src.archive.path), src.template, src.src)
+    return str(src)
+
+_worker_ctx: dict[str, Any] = {}
+
+def _init_render_worker(ctx: dict[str, Any]) -> None:
+    _worker_ctx.clear()
+    _worker_ctx.update(ctx)
+
+def _render_task(task: tuple[int, str | tuple[str, str, str], str]) -> tuple[int, str, Any]:
+    i, ref, mode = task
+    try:
+        if isinstance(ref, tuple):
+            from .archive import open_archive
+
+            src: Source = open_archive(Path(ref[0])).member(ref[1], ref[2])
         else:
-            assert op.text_data is not None
-            op.dst.write_text(op.text_data, encoding="utf-8")
+            src = Path(ref)
+        if mode == "auto" and not _is_text(src):
+            return i, "binary", None
+        # env() and the compiled-template LRU live for the whole worker process, so a body
+        # shared by several files compiles once per worker (or is loaded from the disk cache)
+        return i, "text", compile_template(env(), _read_text(src)).render(**_worker_ctx)
+    except Exception as exc:
+        try:
+            pickle.dumps(exc)
+        except Exception:
+            exc = ForgeError(f"{type(exc).__name__}: {exc}")
+        return i, "error", exc
+
+def _is_utf8(path: Path) -> bool:
+    # Decode incrementally so large binaries are never held in memory.
+    dec = codecs.getincrementaldecoder("utf-8")()
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(STREAM_CHUNK):
+                dec.decode(chunk)
+        dec.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+def stream_entry(
+    e: Environment, dst_path: Path, src_path: Source, mode: str, ctx: Mapping[str, Any]
+) -> WriteOp:
+    """Like render_entry, but text bodies are left as a lazy ``generate()`` stream."""
+    with span(str(dst_path), "render"):
+        return _stream_entry(e, dst_path, src_path, mode, ctx)
+
+def _stream_entry(
+    e: Environment, dst_path: Path, src_path: Source, mode: str, ctx: Mapping[str, Any]
+) -> WriteOp:
+    if mode == "auto":
+        mode = "text" if _is_text(src_path) else "binary"
+    if mode == "binary":
+        return _binary_op(dst_path, src_path)
+
+    # always streamed: a short template with a big loop can still render a huge file
+    tmpl = compile_template(e, _read_text(src_path))
+    return WriteOp(dst=dst_path, chunks=tmpl.generate(**ctx))
+
+def stream_and_write(
+    e: Environment,
+    dst_path: Path,
+    src_path: Source,
+    mode: str,
+    ctx: Mapping[str, Any],
+    write: Callable[[WriteOp], T],
+) -> tuple[WriteOp, T]:
+    """stream_entry, then ``write(op)``; traced as one render and one write span per file.
+
+    A streamed text body is rendered while it is written, so the time spent inside the
+    template's generator counts as render and the rest as write. Both are also reported
+    as "render"/"write" phases, laid end to end. ``write`` must not open its own spans.
+    """
+    if not listening():
+        op = _stream_entry(e, dst_path, src_path, mode, ctx)
+        return op, write(op)
+    t0 = time.perf_counter()
+    op = _stream_entry(e, dst_path, src_path, mode, ctx)
+    rendering = [time.perf_counter() - t0]
+    if op.chunks is not None:
+        op = replace(op, chunks=_timed(op.chunks, rendering))
+    result = write(op)
+    spent, took = rendering[0], time.perf_counter() - t0
+    for name, cat in ((str(dst_path), "render"), ("render", "phase")):
+        record(name, cat, t0, spent)
+    for name, cat in ((str(dst_path), "write"), ("write", "phase")):
+        record(name, cat, t0 + spent, took - spent)
+    return op, result
+
+def _timed(chunks: Iterable[str], spent: list[float]) -> Iterator[str]:
+    # adds the time spent producing each chunk to spent[0]
+    it = iter(chunks)
+    while True:
+        t = time.perf_counter()
+        try:
+            chunk = next(it)
+        except StopIteration:
+            return
+        finally:
+            spent[0] += time.perf_counter() - t
+        yield chunk
+
+def iter_plan(tpl: Template, dest: Path, ctx: Mapping[str, Any]) -> Iterator[WriteOp]:
+    """Lazily yield write operations, one file at a time.
+
+    Binary files are copied from the template (never read into memory) and text files
+    are rendered with Jinja's ``generate()``, so each op must be written before the next
+    one is pulled.
+    """
+    e = env()
+    for dst_path, src_path, mode in iter_sources(tpl, dest, ctx):
+        yield stream_entry(e, dst_path, src_path, mode, ctx)
+
+def write_op(
+    op: WriteOp,
+    force: bool,
+    skip_identical: bool = True,
+    root: Path | None = None,
+    checked: set[Path] | None = None,
+    traced: bool = True,
+) -> str:
+    """Write one op; returns "written", "changed" or "skipped" (see WriteReport).
+
+    With ``root``, every directory between it and the file must be a real directory (no
+    symlinks out of the project), as in apply_plan's preflight; pass the same ``checked``
+    set for every op of a plan so each directory is looked at once. ``traced=False``
+    skips the per-file write span (stream_and_write reports its own).
+    """
+    if root is not None:
+        _check_parents(op.dst.parent, root, checked if checked is not None else set())
+    op.dst.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        st = os.lstat(op.dst)
+    except FileNotFoundError:
+        existing: int | None = None
+    else:
+        if stat.S_ISLNK(st.st_mode):
+            raise ForgeError(f"Refusing to overwrite symlink: {op.dst}")
+        existing = st.st_size
+    if existing is not None and not force:
+        raise ForgeError(f"File exists: {op.dst} (use --force)")
+    if not traced:
+        return _write_checked_inner(op, existing, skip_identical)
+    return _write_checked(op, existing, skip_identical)
+
+def _check_parents(d: Path, root: Path, checked: set[Path]) -> None:
+    todo = []
+    while d not in checked and d != root and d != d.parent:
+        todo.append(d)
+        d = d.parent
+    for d in reversed(todo):  # outermost first
+        try:
+            st = os.lstat(d)
+        except FileNotFoundError:
+            break  # created by mkdir below, as are the ones inside it
+        if not stat.S_ISDIR(st.st_mode):
+            raise ForgeError(f"Refusing to write through non-directory: {d}")
+    checked.update(todo)
+
+def _write_checked(op: WriteOp, existing_size: int | None, skip_identical: bool) -> str:
+    with span(str(op.dst), "write"):
+        return _write_checked_inner(op, existing_size, skip_identical)
+
+def _write_checked_inner(op: WriteOp, existing_size: int | None, skip_identical: bool) -> str:
+    if existing_size is None:
+        _write(op)
+        return "written"
+    if skip_identical and _is_identical(op, existing_size):
+        return "skipped"
+    _write(op)
+    return "changed"
+
+def _is_identical(op: WriteOp, existing_size: int) -> bool:
+    # size first (free: it comes from the preflight stat), then a streaming hash
+    size = op.size()
+    if size is None or size != existing_size:
+        return False
+    return op.digest() == file_digest(op.dst)
+
+def _write(op: WriteOp) -> None:
+    if op.src is not None:
+        copy_file(op.src, op.dst)
+    elif op.chunks is not None:
+        with open(op.dst, "w", encoding="utf-8") as f:
+            for chunk in op.chunks:
+                f.write(chunk)
+    elif op.is_binary:
+        assert op.bytes_data is not None
+        op.dst.write_bytes(op.bytes_data)
+    else:
+        assert op.text_data is not None
+        op.dst.write_text(op.text_data, encoding="utf-8")
+
+def _scan_dirs(dirs: Iterable[Path]) -> dict[Path, dict[str, os.DirEntry] | None]:
+    """One scandir per directory (parents first); None marks a directory that does not exist yet."""
+    listing: dict[Path, dict[str, os.DirEntry] | None] = {}
+    for d in sorted(dirs, key=lambda p: len(p.parts)):
+        if listing.get(d.parent, {}) is None:
+            listing[d] = None  # parent is missing, so this one is too
+            continue
+        try:
+            with os.scandir(d) as it:
+                listing[d] = {entry.name: entry for entry in it}
+        except FileNotFoundError:
+            listing[d] = None
+    return listing
+
+def apply_plan(
+    ops: Iterable[WriteOp],
+    force: bool,
+    root: Path | None = None,
+    jobs: int | None = None,
+    skip_identical: bool = True,
+    staged: bool = False,
+    on_write: Callable[..., None] | None = None,
+) -> WriteReport:
+    """Write a plan: one preflight pass over the target tree, then writes from a thread pool.
+
+    ``root`` is the (resolved) project root; every directory between it and the files is
+    listed once, so conflicts are reported before anything is written and no per-file
+    mkdir/exists calls are needed. With ``force``, existing files that already hold the
+    same bytes are left untouched unless ``skip_identical`` is False.
+
+    With ``staged``, files are first written into a staging directory on the same
+    filesystem and only published (renamed into place) once all of them succeeded, so a
+    failing render or write leaves the target tree as it was.
+
+    ``on_write(op, status)`` is called as each file lands (from the writer threads).
+    """
+    report = WriteReport()
+    # later ops for the same destination win, as with sequential writes
+    by_dst: dict[Path, WriteOp] = {}
+    for op in ops:
+        by_dst.pop(op.dst, None)
+        by_dst[op.dst] = op
+    if not by_dst:
+        return report
+    if root is None:
+        root = Path(os.path.commonpath([str(dst.parent) for dst in by_dst]))
+
+    dirs: set[Path] = {root}
+    for dst in by_dst:
+        d = dst.parent
+        while d not in dirs and d != d.parent:
+            dirs.add(d)
+            d = d.parent
+    listing = _scan_dirs(dirs)
+
+    for d in sorted(dirs, key=lambda p: len(p.parts)):
+        if d == root or listing.get(d.parent) is None:
+            continue
+        entry = listing[d.parent].get(d.name)
+        if entry is not None and (entry.is_symlink() or not entry.is_dir()):
+            raise ForgeError(f"Refusing to write through non-directory: {d}")
+
+    existing: dict[Path, int] = {}
+    for dst in by_dst:
+        entry = (listing.get(dst.parent) or {}).get(dst.name)
+        if entry is None:
+            continue
+        if entry.is_symlink():
+            raise ForgeError(f"Refusing to overwrite symlink: {dst}")
+        if not force:
+            raise ForgeError(f"File exists: {dst} (use --force)")
+        existing[dst] = entry.stat(follow_symlinks=False).st_size
+
+    todo = list(by_dst.values())
+    if staged:
+        return _apply_staged(
+            todo, root, dirs, listing, existing, skip_identical, jobs, on_write
+        )
+
+    for d in sorted(dirs, key=lambda p: len(p.parts)):
+        if listing[d] is None:
+            d.mkdir(parents=d == root, exist_ok=True)
+
+    def work(op: WriteOp) -> str:
+        status = _write_checked(op, existing.get(op.dst), skip_identical)
+        if on_write is not None:
+            on_write(op, status)
+        return status
+
+    for status in _map_writes(work, todo, jobs):
+        report.add(status)
+    return report
+
+def _map_writes(work: Any, todo: list[WriteOp], jobs: int | None) -> list[str]:
+    workers = min(jobs or WRITE_JOBS, len(todo))
+    if workers <= 1 or len(todo) < PARALLEL_WRITE_MIN:
+        return [work(op) for op in todo]
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(work, todo))
+
+def _apply_staged(
+    todo: list[WriteOp],
+    root: Path,
+    dirs: set[Path],
+    listing: dict[Path, dict[str, os.DirEntry] | None],
+    existing: dict[Path, int],
+    skip_identical: bool,
+    jobs: int | None,
+    on_write: Callable[..., None] | None = None,
+) -> WriteReport:
+    # A new project is staged next to its final location and appears with a single
+    # rename; an existing one is staged in a hidden directory inside it and each file is
+    # renamed over its target. Either way the staging area shares the target filesystem.
+    fresh = listing[root] is None
+    if fresh:
+        root.parent.mkdir(parents=True, exist_ok=True)
+        stage = root.parent / f".{root.name}.forge-stage-{os.getpid()}-{os.urandom(4).hex()}"
+    else:
+        stage = root / f".forge-stage-{os.getpid()}-{os.urandom(4).hex()}"
+    # plain mkdir (not mkdtemp's 0700) so a staged new project gets the usual umask mode
+    stage.mkdir()
+
+    def work(op: WriteOp) -> str:
+        with span(str(op.dst), "write"):
+            size = existing.get(op.dst)
+            if size is not None and skip_identical and _is_identical(op, size):
+                return "skipped"
+            tmp = stage / op.dst.relative_to(root)
+            tmp.parent.mkdir(parents=True, exist_ok=True)
+            _write(replace(op, dst=tmp))
+            if size is not None:
+                shutil.copymode(op.dst, tmp)  # renaming over the file must not reset its mode
+            return "written" if size is None else "changed"
+
+    report = WriteReport()
+    try:
+        statuses = _map_writes(work, todo, jobs)
+        with span("publish", "step"):
+            if fresh:
+                os.rename(stage, root)
+            else:
+                for d in sorted(dirs, key=lambda p: len(p.parts)):
+                    if listing[d] is None:
+                        d.mkdir(exist_ok=True)
+                for op, status in zip(todo, statuses):
+                    if status != "skipped":
+                        os.replace(stage / op.dst.relative_to(root), op.dst)
+    finally:
+        shutil.rmtree(stage, ignore_errors=True)
+    for op, status in zip(todo, statuses):
+        report.add(status)
+        if on_write is not None:
+            on_write(op, status)  # only once published
+    return report
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import hmac
+import json
+import os
+import secrets
+import socketserver
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from .fs import ForgeError, WriteReport
+from .index import forget, pack_index
+from .packs import APP_DIR, PACKS_FILE, Pack, list_packs
+from .plan import find_templates, generate, get_template, resolve_vars
+
+SERVE_WORKERS = 4
+# bearer token for the HTTP listener, rewritten (mode 0600) on every start
+TOKEN_NAME = "forge-serve.token"
+
+class ForgeService:
+    """Long-lived state for `forge serve`: packs, indexes and compiled templates stay warm.
+
+    Requests are plain dicts (``{"op": "generate", ...}``) and so are responses
+    (``{"ok": true, "result": ...}`` or ``{"ok": false, "error": "..."}``). Work runs on a
+    bounded thread pool; packs are reloaded whenever packs.json changes.
+    """
+
+    def __init__(self, builtin_root: Path, workers: int = SERVE_WORKERS) -> None:
+        self.builtin_root = builtin_root
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="forge-serve")
+        self._lock = threading.Lock()
+        self._packs_sig: tuple[int, int] | None = None
+        self._packs: list[Pack] = []
+
+    def packs(self) -> list[Pack]:
+        try:
+            st = PACKS_FILE.stat()
+            sig = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            sig = (0, 0)
+        with self._lock:
+            if sig != self._packs_sig:
+                forget()  # re-check pack contents on disk once per reload
+                packs = list_packs(self.builtin_root)
+                for pack in packs:
+                    pack_index(pack)  # index up front so the first request does not pay for it
+                self._packs, self._packs_sig = packs, sig
+            return self._packs
+
+    def handle(self, request: Any) -> dict[str, Any]:
+        return self._pool.submit(self._dispatch, request).result()
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def _dispatch(self, request: Any) -> dict[str, Any]:
+        try:
+            if not isinstance(request, dict):
+                raise ForgeError("Request must be a JSON object")
+            op = request.get("op")
+            fn = getattr(self, f"op_{op}", None) if isinstance(op, str) else None
+            if fn is None:
+                raise ForgeError(f"Unknown op {op!r} (expected ping, list, generate or add)")
+            return {"ok": True, "result": fn(request)}
+        except Exception as e:
+            error = str(e) if isinstance(e, ForgeError) else f"{type(e).__name__}: {e}"
+            return {"ok": False, "error": error}
+
+    def op_ping(self, request: dict[str, Any]) -> str:
+        return "pong"
+
+    def op_list(self, request: dict[str, Any]) -> list[dict[str, str]]:
+        return [
+            {"name": t.name, "pack": t.pack.name, "kind": t.pack.kind}
+            for t in find_templates(self.packs())
+        ]
+
+    def op_generate(self, request: dict[str, Any]) -> dict[str, Any]:
+        packs = self.packs()
+        name = str(request.get("template", ""))
+        dest = _dest(request)
+        provided = {str(k): str(v) for k, v in (request.get("vars") or {}).items()}
+        lt = get_template(name, packs)
+        ctx = resolve_vars(lt.manifest, provided)
+        report = WriteReport()
+        created = generate(
+            lt,
+            dest,
+            packs,
+            ctx,
+            force=bool(request.get("force", False)),
+            dry_run=bool(request.get("dry_run", False)),
+            yes=True,
+            init_git=bool(request.get("git", False)),
+            hooks=bool(request.get("hooks", False)),  # nobody can confirm them, so opt-in
+            atomic=bool(request.get("atomic", False)),
+            report=report,
+            render_jobs=1,  # never fork a render pool from this multi-threaded process
+        )
+        return {
+            "created": created,
+            "written": report.written,
+            "changed": report.changed,
+            "skipped": report.skipped,
+        }
+
+    def op_add(self, request: dict[str, Any]) -> dict[str, Any]:
+        from project_forge.features import apply_many
+        from project_forge.features import get as get_feature
+
+        names = request.get("features") or []
+        if isinstance(names, str):
+            names = [names]
+        chosen = [get_feature(str(n)) for n in names]
+        if not chosen:
+            raise ForgeError("'features' must name at least one feature")
+        report = apply_many(chosen, _dest(request), bool(request.get("force", False)))
+        return {
+            "applied": [f.name for f in chosen],
+            "written": report.written,
+            "changed": report.changed,
+        }
+
+def _dest(request: dict[str, Any]) -> Path:
+    dest = Path(str(request.get("dest", "")))
+    if not dest.is_absolute():
+        raise ForgeError("'dest' must be an absolute path")
+    return dest
+
+class _LineHandler(socketserver.StreamRequestHandler):
+    # one JSON request per line, one JSON response per line; connections may be reused
+    def handle(self) -> None:
+        service: ForgeService = self.server.service  # type: ignore[attr-defined]
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                response: dict[str, Any] = {"ok": False, "error": f"Invalid JSON: {e}"}
+            else:
+                response = service.handle(request)
+                if isinstance(request, dict) and "id" in request:
+                    response["id"] = request["id"]
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+class _HTTPHandler(BaseHTTPRequestHandler):
+    # GET /list, GET /ping, POST /<op> with a JSON body. Every request needs the bearer
+    # token; browsers are kept out by the Host and Origin checks (DNS rebinding, cross-site
+    # "simple" POSTs) and by requiring a JSON content type.
+    def do_GET(self) -> None:
+        if self._allowed():
+            self._reply({"op": self.path.strip("/")})
+
+    def do_POST(self) -> None:
+        if not self._allowed():
+            return
+        if self.headers.get_content_type() != "application/json":
+            self._send(415, {"ok": False, "error": "Content-Type must be application/json"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            self._send(400, {"ok": False, "error": f"Invalid JSON: {e}"})
+            return
+        if not isinstance(body, dict):
+            self._send(400, {"ok": False, "error": "Request must be a JSON object"})
+            return
+        self._reply({**body, "op": self.path.strip("/")})
+
+    def _allowed(self) -> bool:
+        port = self.server.server_address[1]
+        if self.headers.get("Host") not in (f"127.0.0.1:{port}", f"localhost:{port}"):
+            self._send(403, {"ok": False, "error": "Unexpected Host header"})
+            return False
+        if "Origin" in self.headers:
+            self._send(403, {"ok": False, "error": "Cross-origin requests are not accepted"})
+            return False
+        expected = f"Bearer {self.server.token}"  # type: ignore[attr-defined]
+        if not hmac.compare_digest(self.headers.get("Authorization", ""), expected):
+            self._send(401, {"ok": False, "error": "Missing or wrong bearer token"})
+            return False
+        return True
+
+    def _reply(self, request: dict[str, Any]) -> None:
+        response = self.server.service.handle(request)  # type: ignore[attr-defined]
+        self._send(200 if response["ok"] else 400, response)
+
+    def _send(self, status: int, payload: dict[str, Any]) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+def start(
+    service: ForgeService,
+    socket_path: Path | None = None,
+    port: int | None = None,
+    token_path: Path | None = None,
+) -> list[socketserver.BaseServer]:
+    """Start the Unix socket and/or localhost HTTP listeners, each on its own thread.
+
+    The HTTP listener gets a fresh bearer token, written to ``token_path`` (default: next
+    to the socket, or in the app dir) readable only by this user.
+    """
+    servers: list[socketserver.BaseServer] = []
+    if socket_path is not None:
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        socket_path.unlink(missing_ok=True)
+        unix = _UnixServer(str(socket_path), _LineHandler)
+        # requests write files as this user: keep the socket private
+        os.chmod(socket_path, 0o600)
+        servers.append(unix)
+    if port is not None:
+        if token_path is None:
+            token_path = (socket_path.parent if socket_path else APP_DIR) / TOKEN_NAME
+        http = ThreadingHTTPServer(("127.0.0.1", port), _HTTPHandler)
+        http.token = secrets.token_urlsafe(32)  # type: ignore[attr-defined]
+        http.token_path = token_path  # type: ignore[attr-defined]
+        _write_private(token_path, http.token)  # type: ignore[attr-defined]
+        servers.append(http)
+    if not servers:
+        raise ForgeError("Nothing to serve on (give a socket path and/or a port)")
+    for server in servers:
+        server.service = service  # type: ignore[attr-defined]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return servers
+
+def _write_private(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)  # O_EXCL below: never reuse a file someone else created
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text + "\n")
+
+def stop(servers: list[socketserver.BaseServer]) -> None:
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+        if isinstance(server, _UnixServer):
+            Path(server.server_address).unlink(missing_ok=True)  # type: ignore[arg-type]
+        token_path = getattr(server, "token_path", None)
+        if token_path is not None:
+            token_path.unlink(missing_ok=True)
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable
+
+from .fs import COPY_CHUNK, ForgeError, WriteOp
+
+ARCHIVE_FORMATS = ("tar.gz", "zip")
+# the modes a directory write gets under the usual 022 umask
+FILE_MODE = 0o644
+DIR_MODE = 0o755
+# streamed text (unknown size) is spooled to disk past this for tar, which needs sizes up front
+SPOOL_MAX = 8 * 1024 * 1024
+
+class Sink(ABC):
+    """Where a rendered plan goes instead of a directory: one ``add`` per file, then ``close``.
+
+    Entries are named ``<prefix>/<rel>`` with parent directories added first. Bodies are
+    copied through in COPY_CHUNK pieces (binary assets straight from the pack file or the
+    mapped archive), and ``add`` returns the sha256 and size of what it wrote. If the
+    ``with`` block fails, the archive is never finished: a file we opened is removed and a
+    stream (stdout) is cut off without its trailer, so consumers see an error rather than a
+    well-formed, truncated archive.
+    """
+
+    def __init__(self, out: BinaryIO, prefix: str = "", owned: Path | None = None) -> None:
+        self.out = _Output(out)
+        self.prefix = prefix.strip("/")
+        self.mtime = time.time()
+        self._owned = owned  # file we opened (closed, and removed on failure)
+        self._dirs: set[str] = set()
+
+    def add(self, rel: str, op: WriteOp) -> tuple[str, int]:
+        name = f"{self.prefix}/{rel}" if self.prefix else rel
+        parts = name.split("/")
+        for i in range(1, len(parts)):
+            d = "/".join(parts[:i])
+            if d not in self._dirs:
+                self._dirs.add(d)
+                self._add_dir(d)
+        h = hashlib.sha256()
+        if op.src is not None:
+            with open(op.src, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                self._add_file(name, size, _Hashing(f, h))
+        elif op.chunks is not None:
+            size = self._add_stream(name, (c.encode("utf-8") for c in op.chunks), h)
+        else:
+            data = op.bytes_data if op.is_binary else (op.text_data or "").encode("utf-8")
+            assert data is not None
+            size = len(data)
+            self._add_file(name, size, _Hashing(_ViewReader(memoryview(data)), h))
+        return h.hexdigest(), size
+
+    def close(self) -> None:
+        self._close()
+        if self._owned is not None:
+            self.out.raw.close()
+
+    def abort(self) -> None:
+        # let tarfile/zipfile release their state, but drop the end-of-archive bytes
+        self.out.cut = True
+        self.close()
+        if self._owned is not None:
+            self._owned.unlink(missing_ok=True)
+
+    def __enter__(self) -> Sink:
+        return self
+
+    def __exit__(self, exc_type: Any, *exc: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    @abstractmethod
+    def _add_dir(self, name: str) -> None: ...
+
+    @abstractmethod
+    def _add_file(self, name: str, size: int, reader: Any) -> None: ...
+
+    @abstractmethod
+    def _add_stream(self, name: str, chunks: Iterable[bytes], h: Any) -> int: ...
+
+    @abstractmethod
+    def _close(self) -> None: ...
+
+class TarSink(Sink):
+    def __init__(self, out: BinaryIO, prefix: str = "", owned: Path | None = None) -> None:
+        super().__init__(out, prefix, owned)
+        # stream mode: nothing is seeked, so stdout and pipes work
+        self._tar = tarfile.open(fileobj=self.out, mode="w|gz", format=tarfile.PAX_FORMAT)
+
+    def _info(self, name: str, mode: int) -> tarfile.TarInfo:
+        info = tarfile.TarInfo(name)
+        info.mode = mode
+        info.mtime = int(self.mtime)
+        return info
+
+    def _add_dir(self, name: str) -> None:
+        info = self._info(name, DIR_MODE)
+        info.type = tarfile.DIRTYPE
+        self._tar.addfile(info)
+
+    def _add_file(self, name: str, size: int, reader: Any) -> None:
+        info = self._info(name, FILE_MODE)
+        info.size = size
+        self._tar.addfile(info, reader)
+
+    def _add_stream(self, name: str, chunks: Iterable[bytes], h: Any) -> int:
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX) as spool:
+            for chunk in chunks:
+                h.update(chunk)
+                spool.write(chunk)
+            size = spool.tell()
+            spool.seek(0)
+            self._add_file(name, size, spool)
+        return size
+
+    def _close(self) -> None:
+        self._tar.close()
+
+class ZipSink(Sink):
+    def __init__(self, out: BinaryIO, prefix: str = "", owned: Path | None = None) -> None:
+        super().__init__(out, prefix, owned)
+        # an unseekable stream (stdout) gets data descriptors instead of patched headers
+        self._zip = zipfile.ZipFile(self.out, mode="w", compression=zipfile.ZIP_DEFLATED)
+
+    def _info(self, name: str, mode: int) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(name, time.localtime(self.mtime)[:6])
+        info.create_system = 3  # unix, so external_attr carries the mode
+        info.external_attr = mode << 16
+        info.compress_type = zipfile.ZIP_DEFLATED
+        return info
+
+    def _add_dir(self, name: str) -> None:
+        info = self._info(name + "/", 0o040000 | DIR_MODE)
+        info.external_attr |= 0x10  # MS-DOS directory flag
+        info.compress_type = zipfile.ZIP_STORED
+        self._zip.writestr(info, b"")
+
+    def _add_file(self, name: str, size: int, reader: Any) -> None:
+        info = self._info(name, 0o100000 | FILE_MODE)
+        info.file_size = size  # decides zip64 up front
+        with self._zip.open(info, "w") as dst:
+            shutil.copyfileobj(reader, dst, COPY_CHUNK)
+
+    def _add_stream(self, name: str, chunks: Iterable[bytes], h: Any) -> int:
+        info = self._info(name, 0o100000 | FILE_MODE)
+        size = 0
+        with self._zip.open(info, "w", force_zip64=True) as dst:
+            for chunk in chunks:
+                h.update(chunk)
+                dst.write(chunk)
+                size += len(chunk)
+        return size
+
+    def _close(self) -> None:
+        self._zip.close()
+
+class _Output:
+    # the archive writers write through this, so an aborted run can stop all further output
+    def __init__(self, raw: BinaryIO) -> None:
+        self.raw = raw
+        self.cut = False
+
+    def write(self, data: bytes) -> int:
+        return len(data) if self.cut else self.raw.write(data)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.raw, name)  # tell/seek/flush, as the writer probes for them
+
+class _ViewReader:
+    # file-like reads over a memoryview (a mapped archive member or encoded text)
+    def __init__(self, view: memoryview) -> None:
+        self._view = view
+        self._pos = 0
+
+    def read(self, n: int = -1) -> bytes:
+        end = len(self._view) if n is None or n < 0 else self._pos + n
+        data = self._view[self._pos : end]
+        self._pos += len(data)
+        return bytes(data)
+
+class _Hashing:
+    def __init__(self, f: Any, h: Any) -> None:
+        self._f = f
+        self._h = h
+
+    def read(self, n: int = -1) -> bytes:
+        data = self._f.read(n)
+        self._h.update(data)
+        return data
+
+def archive_format(target: str, fmt: str | None = None) -> str:
+    if fmt is None:
+        fmt = "zip" if target.lower().endswith(".zip") else "tar.gz"
+    if fmt not in ARCHIVE_FORMATS:
+        raise ForgeError(
+            f"Unknown archive format {fmt!r} (expected {' or '.join(ARCHIVE_FORMATS)})"
+        )
+    return fmt
+
+def open_sink(target: str, fmt: str | None = None, prefix: str = "") -> Sink:
+    """Open a tar.gz or zip sink on ``target`` (a file path, or ``-`` for stdout).
+
+    The format comes from ``fmt``, else the file name (``.zip``), else tar.gz.
+    """
+    cls = ZipSink if archive_format(target, fmt) == "zip" else TarSink
+    if target == "-":
+        return cls(sys.stdout.buffer, prefix)
+    path = Path(target)
+    return cls(open(path, "wb"), prefix, owned=path)
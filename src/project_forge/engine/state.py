@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Mapping
+
+from .archive import ArchiveMember, source_digest
+from .fs import ForgeError, WriteOp, atomic_file, file_digest
+
+# Written into every generated project; lets `forge update` re-render only what changed.
+STATE_FILE = ".forge/state.json"
+STATE_VERSION = 1
+
+@dataclass
+class ProjectState:
+    template: str
+    pack: str
+    commit: str | None
+    vars: dict[str, Any]
+    # project-relative path -> {"hash": sha256 of the written file, "src": sha256 of its source}
+    files: dict[str, dict[str, str]] = field(default_factory=dict)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "version": STATE_VERSION,
+            "template": self.template,
+            "pack": self.pack,
+            "commit": self.commit,
+            "vars": self.vars,
+            "files": self.files,
+        }
+
+def state_path(dest: Path) -> Path:
+    return dest / STATE_FILE
+
+def read_state(dest: Path) -> ProjectState | None:
+    path = state_path(dest)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        raise ForgeError(f"Corrupt state file {path}: {e}")
+    if data.get("version") != STATE_VERSION:
+        raise ForgeError(f"Unsupported state file version in {path}")
+    return ProjectState(
+        template=data["template"],
+        pack=data.get("pack", ""),
+        commit=data.get("commit"),
+        vars=data.get("vars", {}),
+        files=data.get("files", {}),
+    )
+
+def state_text(state: ProjectState) -> str:
+    return json.dumps(state.to_json(), indent=2, sort_keys=True, default=str) + "\n"
+
+def write_state(dest: Path, state: ProjectState) -> None:
+    path = state_path(dest)
+    text = state_text(state)
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return  # keep the mtime stable on no-op regenerations
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_file(path, mode=0o644) as f:
+        f.write(text)
+
+def file_record(op: WriteOp, src: Path | ArchiveMember) -> dict[str, str]:
+    src_hash = source_digest(src)
+    if op.src == src:
+        digest = src_hash  # verbatim copy
+    else:
+        digest = op.digest() or file_digest(op.dst)  # streamed text only exists on disk
+    return {"hash": digest, "src": src_hash}
+
+def vars_of(ctx: Mapping[str, Any]) -> dict[str, Any]:
+    # round-trip through JSON so comparisons with a loaded state are like-for-like
+    return json.loads(json.dumps(dict(ctx), sort_keys=True, default=str))
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    cat: str  # "phase" | "step" (part of a phase) | "compile" | "render" | "write" (per file)
+    start: float  # time.perf_counter() seconds
+    duration: float  # seconds
+    tid: int
+    args: dict[str, Any] = field(default_factory=dict)
+
+_listeners: list[Callable[[Span], None]] = []
+
+def add_listener(fn: Callable[[Span], None]) -> None:
+    """Call ``fn`` with every finished span (from any thread) until removed."""
+    _listeners.append(fn)
+
+def remove_listener(fn: Callable[[Span], None]) -> None:
+    _listeners.remove(fn)
+
+def listening() -> bool:
+    return bool(_listeners)
+
+def record(name: str, cat: str, start: float, duration: float, **args: Any) -> None:
+    """Report a span the caller timed itself (e.g. time summed over interleaved pieces)."""
+    s = Span(name, cat, start, duration, threading.get_ident(), args)
+    for fn in list(_listeners):
+        fn(s)
+
+@contextmanager
+def span(name: str, cat: str = "phase", **args: Any) -> Iterator[None]:
+    if not _listeners:
+        # nobody is collecting: no clock reads, no allocations
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, cat, t0, time.perf_counter() - t0, **args)
+
+class Recorder:
+    """Collect spans while active (``with Recorder() as rec: ...``)."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    def __enter__(self) -> Recorder:
+        add_listener(self.spans.append)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        remove_listener(self.spans.append)
+
+    def phases(self, cat: str = "phase") -> list[tuple[str, float]]:
+        """(phase name, total seconds) in first-seen order; ``cat="step"`` for the steps."""
+        totals: dict[str, float] = {}
+        for s in sorted(self.spans, key=lambda s: s.start):
+            if s.cat == cat:
+                totals[s.name] = totals.get(s.name, 0.0) + s.duration
+        return list(totals.items())
+
+    def total(self, cat: str) -> float:
+        return sum(s.duration for s in self.spans if s.cat == cat)
+
+    def files(self) -> dict[str, dict[str, float]]:
+        """path -> {"render": seconds, "write": seconds}."""
+        out: dict[str, dict[str, float]] = {}
+        for s in self.spans:
+            if s.cat in ("render", "write"):
+                entry = out.setdefault(s.name, {"render": 0.0, "write": 0.0})
+                entry[s.cat] += s.duration
+        return out
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """Trace Event Format, loadable in chrome://tracing and ui.perfetto.dev."""
+        pid = os.getpid()
+        t0 = min((s.start for s in self.spans), default=0.0)
+        events = [
+            {
+                "name": s.name,
+                "cat": s.cat,
+                "ph": "X",
+                "ts": (s.start - t0) * 1e6,
+                "dur": s.duration * 1e6,
+                "pid": pid,
+                "tid": s.tid,
+                "args": {k: str(v) for k, v in s.args.items()},
+            }
+            for s in sorted(self.spans, key=lambda s: s.start)
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Path) -> None:
+        path.write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
@@ -1,26 +1,133 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable
+from typing import Any, Callable, Iterable
 
-from project_forge.engine.fs import ForgeError
+from project_forge.engine.fs import ForgeError, WriteReport, atomic_file
+from project_forge.engine.packs import CACHE_DIR
+from project_forge.engine.project import Project
+
+# Third-party packages add features by declaring, in their pyproject.toml:
+#   [project.entry-points."project_forge.features"]
+#   my-feature = "my_pkg.forge_feature:feature"
+# where the object has name, description, apply(dest, force) and optionally mutate(project).
+ENTRY_POINT_GROUP = "project_forge.features"
+BUILTIN = {
+    "ci-github-actions": "project_forge.features.ci_github_actions:feature",
+    "docker": "project_forge.features.docker:feature",
+    "python-quality": "project_forge.features.python_quality:feature",
+    "release-python-pypi": "project_forge.features.release_python_pypi:feature",
+}
+# name -> description of every feature, so `forge features` imports no feature code
+FEATURE_INDEX = CACHE_DIR / "features.json"
 
 @dataclass(frozen=True)
 class Feature:
     name: str
     description: str
     apply: Callable[[Path, bool], None]
+    # edits a shared Project instead of the disk; needed to combine features in one pass
+    mutate: Callable[[Project], None] | None = None
+
+_LOADED: dict[str, Feature] = {}
+
+def _sources() -> tuple[dict[str, str], dict[str, Any]]:
+    """name -> "module:attr" for builtin and entry-point features, plus the index signature.
+
+    Reads installed distributions' metadata only; no feature module is imported. Entry
+    points override builtins of the same name.
+    """
+    from importlib.metadata import entry_points
+
+    targets = dict(BUILTIN)
+    # builtin modules change with the checkout (editable installs), not a version number
+    builtin: dict[str, int] = {}
+    for name, target in BUILTIN.items():
+        module = target.partition(":")[0].rsplit(".", 1)[-1]
+        builtin[name] = _mtime(Path(__file__).parent / f"{module}.py")
+    plugins: dict[str, list[str]] = {}
+    for ep in sorted(entry_points(group=ENTRY_POINT_GROUP), key=lambda ep: ep.name):
+        targets[ep.name] = ep.value
+        dist = ep.dist
+        plugins[ep.name] = [ep.value, dist.name if dist else "", dist.version if dist else ""]
+    return targets, {"builtin": builtin, "plugins": plugins}
+
+def _mtime(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+def _load(name: str, target: str) -> Feature:
+    if name not in _LOADED:
+        import importlib
+
+        module, _, attr = target.partition(":")
+        try:
+            obj = getattr(importlib.import_module(module), attr or "feature")
+        except (ImportError, AttributeError) as e:
+            raise ForgeError(f"Cannot load feature '{name}' from {target}: {e}")
+        _LOADED[name] = obj
+    return _LOADED[name]
+
+def index() -> dict[str, str]:
+    """Feature name -> description, from a cache keyed by installed distribution versions.
+
+    Only a changed set of plugins (or an edited builtin) imports feature modules, once, to
+    rebuild the cache.
+    """
+    targets, sig = _sources()
+    try:
+        cached = json.loads(FEATURE_INDEX.read_text(encoding="utf-8"))
+        if cached.get("signature") == sig:
+            return cached["features"]
+    except (OSError, ValueError):
+        pass
+    features: dict[str, str] = {}
+    for name, target in sorted(targets.items()):
+        try:
+            features[name] = str(_load(name, target).description)
+        except ForgeError as e:
+            features[name] = f"(unavailable: {e})"
+    try:
+        FEATURE_INDEX.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_file(FEATURE_INDEX) as f:
+            f.write(json.dumps({"signature": sig, "features": features}))
+    except OSError:
+        pass
+    return features
 
 def registry() -> list[Feature]:
-    from .ci_github_actions import feature as ci
-    from .docker import feature as docker
-    from .python_quality import feature as pyq
-    from .release_python_pypi import feature as rel
-    return [ci, docker, pyq, rel]
+    """Every feature, loaded (imports all of them; `index()` is the cheap listing)."""
+    targets, _ = _sources()
+    return [_load(name, target) for name, target in sorted(targets.items())]
 
 def get(name: str) -> Feature:
-    for f in registry():
-        if f.name == name:
-            return f
-    raise ForgeError(f"Unknown feature '{name}'. Try: forge features")
+    """Load one feature; only its own module is imported."""
+    if name in _LOADED:
+        return _LOADED[name]
+    targets, _ = _sources()
+    target = targets.get(name)
+    if target is None:
+        raise ForgeError(f"Unknown feature '{name}'. Try: forge features")
+    return _load(name, target)
+
+def apply_many(
+    features: Iterable[Feature],
+    dest: Path,
+    force: bool,
+    on_write: Callable[..., None] | None = None,
+) -> WriteReport:
+    """Apply features to one in-memory project and write the combined result once.
+
+    Every feature sees the edits of the ones before it; if any of them fails, nothing is written.
+    """
+    project = Project(dest, force)
+    for f in features:
+        mutate = getattr(f, "mutate", None)
+        if mutate is None:
+            raise ForgeError(f"Feature '{f.name}' cannot be combined with other features")
+        mutate(project)
+    return project.flush(on_write)
@@ -1,17 +1,10 @@
 from __future__ import annotations
 
 from pathlib import Path
-from project_forge.engine.fs import ForgeError
+from project_forge.engine.project import Project
 
-def _write(path: Path, text: str, force: bool) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    if path.exists() and not force:
-        raise ForgeError(f"File exists: {path} (use --force)")
-    path.write_text(text, encoding="utf-8")
-
-def apply(dest: Path, force: bool) -> None:
-    yml = dest / ".github/workflows/ci.yml"
-    _write(yml, '''name: CI
+def mutate(project: Project) -> None:
+    project.create(".github/workflows/ci.yml", '''name: CI
 
 on:
   push:
@@ -34,9 +27,15 @@ jobs:
         run: ruff check .
       - name: Tests
         run: pytest
-''', force)
+''')
+
+def apply(dest: Path, force: bool) -> None:
+    project = Project(dest, force)
+    mutate(project)
+    project.flush()
 
 feature = type("FeatureObj", (), {})()
 feature.name = "ci-github-actions"
 feature.description = "Add a GitHub Actions CI workflow (pytest + ruff)."
 feature.apply = apply
+feature.mutate = mutate
@@ -4,6 +4,7 @@ import re
 from pathlib import Path
 
 from project_forge.engine.fs import ForgeError
+from project_forge.engine.project import Project
 
 
 RUFF_SECTION = '''
@@ -50,21 +51,18 @@ PRECOMMIT_CONFIG = '''repos:
 '''
 
 
-def _append_block_if_missing(pyproject: Path, marker: str, block: str) -> None:
-    txt = pyproject.read_text(encoding="utf-8")
+def _append_block_if_missing(txt: str, marker: str, block: str) -> str:
     if marker in txt:
-        return
+        return txt
     if not txt.endswith("\n"):
         txt += "\n"
-    pyproject.write_text(txt + "\n" + block.lstrip("\n"), encoding="utf-8")
+    return txt + "\n" + block.lstrip("\n")
 
 
-def _ensure_dev_extra(pyproject: Path) -> None:
-    txt = pyproject.read_text(encoding="utf-8")
-
+def _ensure_dev_extra(txt: str) -> str:
     # If a dev extra already exists, don't touch it.
     if "[project.optional-dependencies]" in txt and re.search(r"^dev\s*=", txt, flags=re.M):
-        return
+        return txt
 
     dev_line = 'dev = ["pytest", "ruff", "black", "mypy", "pre-commit"]\n'
 
@@ -91,34 +89,37 @@ def _ensure_dev_extra(pyproject: Path) -> None:
         if in_section and not inserted:
             out.append(dev_line)
 
-        pyproject.write_text("".join(out), encoding="utf-8")
-        return
+        return "".join(out)
 
     # Otherwise append a new section
     block = "\n[project.optional-dependencies]\n" + dev_line
     if not txt.endswith("\n"):
         txt += "\n"
-    pyproject.write_text(txt + block, encoding="utf-8")
+    return txt + block
 
 
-def apply(dest: Path, force: bool) -> None:
-    pyproject = dest / "pyproject.toml"
-    if not pyproject.exists():
+def mutate(project: Project) -> None:
+    if not project.exists("pyproject.toml"):
         raise ForgeError("python-quality expects pyproject.toml in the project root")
 
-    _ensure_dev_extra(pyproject)
+    # one read, one in-memory edit, one write (at flush)
+    txt = _ensure_dev_extra(project.read_text("pyproject.toml"))
+    txt = _append_block_if_missing(txt, "[tool.ruff]", RUFF_SECTION)
+    txt = _append_block_if_missing(txt, "[tool.black]", BLACK_SECTION)
+    txt = _append_block_if_missing(txt, "[tool.mypy]", MYPY_SECTION)
+    project.write_text("pyproject.toml", txt)
 
-    _append_block_if_missing(pyproject, "[tool.ruff]", RUFF_SECTION)
-    _append_block_if_missing(pyproject, "[tool.black]", BLACK_SECTION)
-    _append_block_if_missing(pyproject, "[tool.mypy]", MYPY_SECTION)
+    project.create(".pre-commit-config.yaml", PRECOMMIT_CONFIG)
 
-    pc = dest / ".pre-commit-config.yaml"
-    if pc.exists() and not force:
-        raise ForgeError(f"File exists: {pc} (use --force)")
-    pc.write_text(PRECOMMIT_CONFIG, encoding="utf-8")
+
+def apply(dest: Path, force: bool) -> None:
+    project = Project(dest, force)
+    mutate(project)
+    project.flush()
 
 
 feature = type("FeatureObj", (), {})()
 feature.name = "python-quality"
 feature.description = "Add ruff + black + mypy + pre-commit config (and a dev extra in pyproject.toml)."
 feature.apply = apply
+feature.mutate = mutate
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from project_forge.engine.fs import ForgeError
+from project_forge.engine.project import Project
 
 WORKFLOW = '''name: Release
 
@@ -36,14 +36,16 @@ jobs:
         uses: pypa/gh-action-pypi-publish@release/v1
 '''
 
+def mutate(project: Project) -> None:
+    project.create(".github/workflows/release.yml", WORKFLOW)
+
 def apply(dest: Path, force: bool) -> None:
-    wf = dest / ".github/workflows/release.yml"
-    wf.parent.mkdir(parents=True, exist_ok=True)
-    if wf.exists() and not force:
-        raise ForgeError(f"File exists: {wf} (use --force)")
-    wf.write_text(WORKFLOW, encoding="utf-8")
+    project = Project(dest, force)
+    mutate(project)
+    project.flush()
 
 feature = type("FeatureObj", (), {})()
 feature.name = "release-python-pypi"
 feature.description = "Add a tag-based release workflow that builds and publishes to PyPI (Trusted Publishing / OIDC)."
 feature.apply = apply
+feature.mutate = mutate
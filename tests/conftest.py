@@ -0,0 +1,8 @@
+from __future__ import annotations
+
+import os
+import tempfile
+
+# Keep tests away from the real ~/.project-forge (packs, caches, indexes).
+# This must run before project_forge is imported, since paths are resolved at import time.
+os.environ["PROJECT_FORGE_HOME"] = tempfile.mkdtemp(prefix="forge-test-home-")
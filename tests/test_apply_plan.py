@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from project_forge.engine.fs import ForgeError, WriteOp
+from project_forge.engine.render import apply_plan, write_op
+
+
+def _ops(root: Path, n: int) -> list[WriteOp]:
+    return [
+        WriteOp(dst=root / f"d{i % 5}" / "sub" / f"f{i}.txt", text_data=f"{i}\n") for i in range(n)
+    ]
+
+
+def test_apply_plan_writes_in_parallel(tmp_path: Path) -> None:
+    root = tmp_path / "proj"
+    apply_plan(_ops(root, 100), force=False, root=root, jobs=8)
+    assert (root / "d3/sub/f98.txt").read_text() == "98\n"
+    assert sum(1 for _ in root.rglob("*.txt")) == 100
+
+
+def test_conflicts_are_reported_before_any_write(tmp_path: Path) -> None:
+    root = tmp_path / "proj"
+    ops = _ops(root, 40)
+    ops[-1].dst.parent.mkdir(parents=True)
+    ops[-1].dst.write_text("mine", encoding="utf-8")
+
+    with pytest.raises(ForgeError, match="File exists"):
+        apply_plan(ops, force=False, root=root)
+    assert not ops[0].dst.exists()
+
+    apply_plan(ops, force=True, root=root)
+    assert ops[-1].dst.read_text() == "39\n"
+
+
+def test_refuses_to_write_through_symlinked_dirs(tmp_path: Path) -> None:
+    root = tmp_path / "proj"
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    root.mkdir()
+    os.symlink(outside, root / "d0")
+    with pytest.raises(ForgeError, match="non-directory"):
+        apply_plan(_ops(root, 3), force=True, root=root)
+    # stream mode writes op by op, with the same check
+    with pytest.raises(ForgeError, match="non-directory"):
+        write_op(_ops(root, 1)[0], force=True, root=root)
+    assert not any(outside.iterdir())
+
+
+def test_force_skips_identical_files(tmp_path: Path) -> None:
+    root = tmp_path / "proj"
+    ops = _ops(root, 20)
+    report = apply_plan(ops, force=False, root=root)
+    assert (report.written, report.changed, report.skipped) == (20, 0, 0)
+
+    untouched = ops[0].dst.stat().st_mtime_ns
+    ops[1] = WriteOp(dst=ops[1].dst, text_data="new\n")
+    report = apply_plan(ops, force=True, root=root)
+    assert (report.written, report.changed, report.skipped) == (0, 1, 19)
+    assert ops[0].dst.stat().st_mtime_ns == untouched
+    assert ops[1].dst.read_text() == "new\n"
+
+
+def _failing_chunks():
+    yield "partial"
+    raise RuntimeError("render failed")
+
+
+@pytest.mark.parametrize("existing", [False, True])
+def test_staged_write_leaves_nothing_behind_on_failure(tmp_path: Path, existing: bool) -> None:
+    root = tmp_path / "proj"
+    if existing:
+        root.mkdir()
+        (root / "keep.txt").write_text("mine", encoding="utf-8")
+    ops = _ops(root, 30) + [WriteOp(dst=root / "big.txt", chunks=_failing_chunks())]
+
+    with pytest.raises(RuntimeError):
+        apply_plan(ops, force=False, root=root, staged=True)
+    left = sorted(p.name for p in tmp_path.rglob("*"))
+    assert left == (["keep.txt", "proj"] if existing else [])
+
+
+def test_staged_write_publishes_by_rename(tmp_path: Path) -> None:
+    root = tmp_path / "proj"
+    report = apply_plan(_ops(root, 30), force=False, root=root, staged=True)
+    assert report.written == 30
+    assert (root / "d2/sub/f7.txt").read_text() == "7\n"
+
+    target = root / "d0/sub/f0.txt"
+    os.chmod(target, 0o750)
+    ops = _ops(root, 30)
+    ops[0] = WriteOp(dst=target, text_data="new\n")
+    report = apply_plan(ops, force=True, root=root, staged=True)
+    assert (report.changed, report.skipped) == (1, 29)
+    assert target.read_text() == "new\n" and target.stat().st_mode & 0o777 == 0o750
+    assert not any(p.name.startswith(".forge-stage") for p in root.iterdir())
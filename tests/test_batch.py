@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from project_forge.engine.packs import list_packs
+from project_forge.engine.plan import BatchItem, generate_many
+
+
+def _builtin_root() -> Path:
+    return Path(__file__).resolve().parents[1] / "src/project_forge/templates_builtin"
+
+
+def test_generate_many_reports_per_project(tmp_path: Path) -> None:
+    packs = list_packs(_builtin_root())
+    ctx = {"project_name": "tool", "package": "tool", "author": "me", "description": "d"}
+    items = [
+        BatchItem("python-cli", tmp_path / "a", ctx),
+        BatchItem("does-not-exist", tmp_path / "b", {}),
+        BatchItem("python-cli", tmp_path / "c", ctx),
+    ]
+
+    results = generate_many(items, packs, force=False, yes=False, jobs=2)
+
+    assert [r.ok for r in results] == [True, False, True]
+    assert [r.item.dest for r in results] == [tmp_path / "a", tmp_path / "b", tmp_path / "c"]
+    assert "not found" in (results[1].error or "")
+    assert (tmp_path / "c/src/tool/__main__.py").exists()
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from project_forge.engine import fs
+from project_forge.engine.fs import copy_file
+
+
+def _payload(tmp_path: Path) -> Path:
+    src = tmp_path / "model.bin"
+    src.write_bytes(os.urandom(3 * 1024 * 1024 + 7))
+    return src
+
+
+def test_copy_file_is_exact(tmp_path: Path) -> None:
+    src = _payload(tmp_path)
+    dst = tmp_path / "out.bin"
+    dst.write_bytes(b"stale contents that are longer than nothing")
+    copy_file(src, dst)
+    assert dst.read_bytes() == src.read_bytes()
+    assert not os.path.samefile(src, dst)
+
+
+def test_copy_file_falls_back_to_userspace(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def unsupported(*args, **kwargs):
+        raise OSError("unsupported")
+
+    monkeypatch.setattr(fs, "_reflink", lambda infd, outfd: False)
+    monkeypatch.setattr(fs, "_copy_file_range", unsupported)
+    monkeypatch.setattr(fs, "_sendfile", unsupported)
+    src = _payload(tmp_path)
+    dst = tmp_path / "out.bin"
+    copy_file(src, dst)
+    assert dst.read_bytes() == src.read_bytes()
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pytest
+
 from project_forge.engine.packs import list_packs
 from project_forge.engine.plan import generate
 from project_forge.engine.render import load_manifest
@@ -69,3 +71,24 @@ def test_apply_docker_feature(tmp_path: Path) -> None:
 
     get_feature("docker").apply(dest, force=True)
     assert (dest / "Dockerfile").exists()
+
+
+def test_apply_many_writes_once_and_nothing_on_failure(tmp_path: Path) -> None:
+    from project_forge.engine.fs import ForgeError
+    from project_forge.features import apply_many
+
+    dest = tmp_path / "proj"
+    dest.mkdir()
+    (dest / "pyproject.toml").write_text('[project]\nname = "x"\n', encoding="utf-8")
+    (dest / "Dockerfile").write_text("FROM scratch\n", encoding="utf-8")
+
+    chosen = [get_feature(n) for n in ("python-quality", "ci-github-actions", "docker")]
+    with pytest.raises(ForgeError, match="Dockerfile"):
+        apply_many(chosen, dest, force=False)
+    assert "[tool.ruff]" not in (dest / "pyproject.toml").read_text(encoding="utf-8")
+    assert not (dest / ".github").exists()
+
+    report = apply_many(chosen[:2], dest, force=False)
+    assert report.written == 2 and report.changed == 1
+    pyproject = (dest / "pyproject.toml").read_text(encoding="utf-8")
+    assert "[tool.ruff]" in pyproject and "dev = [" in pyproject
@@ -1,6 +1,79 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
 from project_forge.features import registry
 
 def test_registry_contains_new_features():
     names = [f.name for f in registry()]
     assert "python-quality" in names
     assert "release-python-pypi" in names
+
+
+def _plugin(site: Path, version: str, description: str) -> None:
+    pkg = site / "forge_hello"
+    pkg.mkdir(exist_ok=True)
+    (pkg / "__init__.py").write_text(
+        "class feature:\n"
+        "    name = 'hello'\n"
+        f"    description = {description!r}\n"
+        "    @staticmethod\n"
+        "    def apply(dest, force):\n"
+        "        (dest / 'HELLO').write_text('hi')\n",
+        encoding="utf-8",
+    )
+    for old in site.glob("forge_hello-*.dist-info"):
+        for f in old.iterdir():
+            f.unlink()
+        old.rmdir()
+    info = site / f"forge_hello-{version}.dist-info"
+    info.mkdir()
+    (info / "METADATA").write_text(
+        f"Metadata-Version: 2.1\nName: forge-hello\nVersion: {version}\n", encoding="utf-8"
+    )
+    (info / "entry_points.txt").write_text(
+        "[project_forge.features]\nhello = forge_hello:feature\n", encoding="utf-8"
+    )
+
+
+def _run(tmp_path: Path, code: str) -> dict:
+    env = {
+        **os.environ,
+        "PROJECT_FORGE_HOME": str(tmp_path / "home"),
+        "PYTHONPATH": str(tmp_path / "site"),
+    }
+    script = (
+        "import json, sys\n"
+        "from project_forge import features\n"
+        f"{code}\n"
+        "mods = [m for m in sys.modules\n"
+        "        if m.startswith('project_forge.features.') or m == 'forge_hello']\n"
+        "print(json.dumps({'out': out, 'imported': sorted(mods)}))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(proc.stdout)
+
+
+def test_entry_point_features_are_indexed_and_loaded_one_at_a_time(tmp_path: Path) -> None:
+    (tmp_path / "site").mkdir()
+    _plugin(tmp_path / "site", "1.0", "Say hello.")
+
+    first = _run(tmp_path, "out = features.index()")
+    assert first["out"]["hello"] == "Say hello." and "docker" in first["out"]
+    # cache hit: listing imports no feature code at all
+    assert _run(tmp_path, "out = features.index()")["imported"] == []
+    # a new plugin version invalidates the cache
+    _plugin(tmp_path / "site", "1.1", "Say hello, louder.")
+    assert _run(tmp_path, "out = features.index()")["out"]["hello"] == "Say hello, louder."
+
+    loaded = _run(tmp_path, "out = features.get('hello').description")
+    assert loaded == {"out": "Say hello, louder.", "imported": ["forge_hello"]}
+    assert _run(tmp_path, "out = features.get('docker').name")["imported"] == [
+        "project_forge.features.docker"
+    ]
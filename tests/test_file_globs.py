@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from project_forge.engine.archive import build_archive, open_archive
+from project_forge.engine.packs import Pack
+from project_forge.engine.plan import generate
+
+
+def _pack(tmp_path: Path) -> Path:
+    root = tmp_path / "pack" / "mono"
+    for rel in (
+        "skel/apps/web/main.py.j2",
+        "skel/apps/api/main.py.j2",
+        "skel/apps/api/main.py.bak",
+        "skel/README.md.j2",
+    ):
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text("# {{ name }}\n", encoding="utf-8")
+    (root / "assets/img").mkdir(parents=True)
+    (root / "assets/img/logo.png").write_bytes(b"\xff\xfe\x00")
+    manifest = {
+        "schema_version": 1,
+        "vars": {"name": {"default": "demo"}},
+        "files": [
+            {"include": "skel/**", "exclude": ["**/*.bak"], "dst": "{{ rel }}"},
+            {
+                "include": ["assets/**/*.png"],
+                "mode": "binary",
+                "dst": "static/{{ name }}/{{ rel }}",
+            },
+        ],
+    }
+    (root / "forge.json").write_text(json.dumps(manifest), encoding="utf-8")
+    return tmp_path / "pack"
+
+
+def _check(dest: Path) -> None:
+    files = sorted(
+        p.relative_to(dest).as_posix()
+        for p in dest.rglob("*")
+        if p.is_file() and ".forge" not in p.parts
+    )
+    assert files == ["README.md", "apps/api/main.py", "apps/web/main.py", "static/x/img/logo.png"]
+    assert (dest / "apps/web/main.py").read_text(encoding="utf-8") == "# x\n"
+    assert (dest / "static/x/img/logo.png").read_bytes() == b"\xff\xfe\x00"
+
+
+def test_include_patterns_expand_with_exclude_mode_and_dst(tmp_path: Path) -> None:
+    packs = [Pack(name="globs", kind="local", path=_pack(tmp_path))]
+    generate(
+        "mono",
+        tmp_path / "out",
+        packs,
+        {"name": "x"},
+        force=False,
+        dry_run=False,
+        yes=True,
+        init_git=False,
+    )
+    _check(tmp_path / "out")
+
+
+def test_archive_stores_only_matched_files(tmp_path: Path) -> None:
+    out = tmp_path / "globs.forgepack"
+    build_archive(_pack(tmp_path), out)
+    assert "skel/apps/api/main.py.bak" not in open_archive(out).templates["mono"]["files"]
+    packs = [Pack(name="globs", kind="archive", path=out, commit=open_archive(out).digest)]
+    generate(
+        "mono",
+        tmp_path / "out",
+        packs,
+        {"name": "x"},
+        force=False,
+        dry_run=False,
+        yes=True,
+        init_git=False,
+    )
+    _check(tmp_path / "out")
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from project_forge.engine.fs import ForgeError
+from project_forge.engine.hook_cache import HookCache
+from project_forge.engine.hooks import parse_hooks, run_post_hooks
+
+PY = sys.executable
+
+
+def _sleep_and_touch(name: str, seconds: float) -> list[str]:
+    code = (
+        f"import time, pathlib; time.sleep({seconds}); "
+        f"pathlib.Path('{name}').write_text(str(time.time())); print('{name} done')"
+    )
+    return [PY, "-c", code]
+
+
+def test_independent_hooks_run_concurrently_and_needs_are_respected(tmp_path: Path, capsys) -> None:
+    manifest = {
+        "hooks": {
+            "post": [
+                {"name": "a", "run": _sleep_and_touch("a", 0.5)},
+                {"name": "b", "run": _sleep_and_touch("b", 0.5)},
+                {"name": "c", "run": _sleep_and_touch("c", 0), "needs": ["a", "b"]},
+            ]
+        }
+    }
+    t0 = time.perf_counter()
+    run_post_hooks(manifest, tmp_path, {}, yes=True)
+    assert time.perf_counter() - t0 < 0.95
+    stamp = {n: float((tmp_path / n).read_text()) for n in "abc"}
+    assert stamp["c"] >= max(stamp["a"], stamp["b"])
+    out = capsys.readouterr().out
+    assert "[a] a done" in out and "[c] c done" in out
+
+
+def test_failure_cancels_running_hooks(tmp_path: Path) -> None:
+    manifest = {
+        "hooks": {
+            "post": [
+                {"name": "slow", "run": _sleep_and_touch("slow", 5)},
+                {"name": "bad", "run": [PY, "-c", "raise SystemExit(3)"]},
+                {"name": "after", "run": _sleep_and_touch("after", 0), "needs": ["bad"]},
+            ]
+        }
+    }
+    t0 = time.perf_counter()
+    with pytest.raises(ForgeError, match="'bad'"):
+        run_post_hooks(manifest, tmp_path, {}, yes=True)
+    assert time.perf_counter() - t0 < 4
+    assert not (tmp_path / "slow").exists() and not (tmp_path / "after").exists()
+
+
+def test_plain_commands_stay_sequential_and_cycles_are_rejected() -> None:
+    hooks = parse_hooks(
+        [["git", "init"], {"name": "deps", "run": ["npm", "ci"]}, ["git", "add", "-A"]]
+    )
+    assert [h.needs for h in hooks] == [(), (), ("post-1",)]
+    with pytest.raises(ForgeError, match="cycle"):
+        parse_hooks(
+            [
+                {"name": "x", "run": ["a"], "needs": ["y"]},
+                {"name": "y", "run": ["b"], "needs": ["x"]},
+            ]
+        )
+
+
+def test_cached_hook_outputs_are_restored_without_rerunning(tmp_path: Path) -> None:
+    install = (
+        "import pathlib; n = pathlib.Path('runs');"
+        "n.write_text(str(int(n.read_text() or 0) + 1) if n.exists() else '1');"
+        "d = pathlib.Path('deps'); d.mkdir(exist_ok=True);"
+        "(d / 'lib.txt').write_text(pathlib.Path('lock.txt').read_text())"
+    )
+    manifest = {
+        "hooks": {
+            "post": [
+                {
+                    "name": "install",
+                    "run": [PY, "-c", install],
+                    "inputs": ["lock.txt"],
+                    "outputs": ["deps"],
+                }
+            ]
+        }
+    }
+
+    def project(name: str, lock: str) -> Path:
+        dest = tmp_path / name
+        dest.mkdir()
+        (dest / "lock.txt").write_text(lock)
+        run_post_hooks(manifest, dest, {}, yes=True)
+        return dest
+
+    first = project("one", "v1")
+    second = project("two", "v1")
+    third = project("three", "v2")
+    assert (first / "runs").exists() and not (second / "runs").exists()
+    assert (second / "deps" / "lib.txt").read_text() == "v1"
+    assert (third / "runs").exists() and (third / "deps" / "lib.txt").read_text() == "v2"
+
+
+def test_restore_keeps_outputs_the_cache_does_not_hold(tmp_path: Path) -> None:
+    cache = HookCache(tmp_path / "cache")
+    built = tmp_path / "built"
+    (built / "dist").mkdir(parents=True)
+    (built / "dist" / "app.js").write_text("bundle")
+    cache.store("k", built, ["dist", "dist.lock"])  # the hook made no dist.lock
+
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    (dest / "dist.lock").write_text("from the template")
+    assert cache.restore("k", dest, ["dist", "dist.lock"])
+    assert (dest / "dist" / "app.js").read_text() == "bundle"
+    assert (dest / "dist.lock").read_text() == "from the template"
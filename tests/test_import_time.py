@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+# Heavy modules that `import project_forge.cli` (i.e. every `forge` invocation) must not load.
+FORBIDDEN = (
+    "jinja2",
+    "rich",
+    "multiprocessing",
+    "project_forge.engine.render",
+    "project_forge.features",
+)
+
+# What `forge list` and `forge features` must not load even when they run: discovery only needs
+# the pack index, not the render stack.
+FORBIDDEN_FOR_LISTING = (
+    "jinja2",
+    "multiprocessing",
+    "project_forge.engine.render",
+    "project_forge.engine.plan",
+    "project_forge.engine.hooks",
+    "project_forge.engine.state",
+    "project_forge.engine.archive",
+)
+
+# Budget for project_forge's own import time (typer is imported first), in microseconds.
+# Generous on purpose: it catches an eager heavy import, not noise.
+BUDGET_US = 60_000
+
+
+def _importtime(code: str) -> dict[str, int]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cum.isdigit():
+            cumulative[name] = int(cum)
+    return cumulative
+
+
+def test_cli_import_is_lean() -> None:
+    mods = _importtime("import project_forge.cli")
+    for name in FORBIDDEN:
+        assert not any(m == name or m.startswith(name + ".") for m in mods), (
+            f"{name} imported at CLI startup"
+        )
+
+
+def test_cli_import_time_budget() -> None:
+    # best of a few runs to smooth out a cold disk cache
+    own = min(_importtime("import typer, project_forge.cli")["project_forge.cli"] for _ in range(3))
+    assert own < BUDGET_US, f"project_forge.cli import took {own} us on top of typer"
+
+
+def _modules_after(args: list[str]) -> list[str]:
+    code = (
+        "import json, sys\n"
+        "from typer.testing import CliRunner\n"
+        "from project_forge.cli import app\n"
+        f"result = CliRunner().invoke(app, {args!r})\n"
+        "assert result.exit_code == 0, result.output\n"
+        "print(json.dumps(sorted(sys.modules)))\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.splitlines()[-1])
+
+
+def test_listing_commands_skip_the_render_stack() -> None:
+    for args in (["list"], ["features"]):
+        mods = _modules_after(args)
+        for name in FORBIDDEN_FOR_LISTING:
+            assert not any(m == name or m.startswith(name + ".") for m in mods), (
+                f"{name} imported by forge {args[0]}"
+            )
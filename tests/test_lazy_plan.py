@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+
+from project_forge.engine.packs import Pack
+from project_forge.engine.plan import generate, plan_project
+
+
+def _packs(tmp_path: Path) -> list[Pack]:
+    root = tmp_path / "pack" / "tpl"
+    root.mkdir(parents=True)
+    (root / "ok.txt.j2").write_text("hi {{ name }}\n", encoding="utf-8")
+    (root / "broken.txt.j2").write_text("{{ name }} {% if %}\n", encoding="utf-8")
+    manifest = {
+        "schema_version": 1,
+        "files": [{"src": "ok.txt.j2", "dst": "{{ name }}/ok.txt.j2"}, {"src": "broken.txt.j2"}],
+    }
+    (root / "forge.json").write_text(json.dumps(manifest), encoding="utf-8")
+    return [Pack(name="p", kind="local", path=tmp_path / "pack")]
+
+
+def test_dry_run_plans_paths_without_rendering_bodies(tmp_path: Path) -> None:
+    packs = _packs(tmp_path)
+    dest = tmp_path / "out"
+    # the broken body would fail a real render; planning never looks at it
+    created = generate(
+        "tpl", dest, packs, {"name": "x"}, force=False, dry_run=True, yes=True, init_git=False
+    )
+    assert created == [str(dest.resolve() / "x/ok.txt"), str(dest.resolve() / "broken.txt")]
+    assert not dest.exists()
+
+
+def test_planned_files_render_on_demand(tmp_path: Path) -> None:
+    ok, broken = plan_project("tpl", tmp_path / "out", _packs(tmp_path), {"name": "x"})
+    assert ok.size() == len(b"hi x\n")
+    assert ok.digest() == hashlib.sha256(b"hi x\n").hexdigest()
+    with pytest.raises(Exception):
+        broken.digest()
+
+
+def test_failed_render_leaves_no_destination(tmp_path: Path) -> None:
+    packs = _packs(tmp_path)
+    dest = tmp_path / "out"
+    with pytest.raises(Exception):
+        generate(
+            "tpl",
+            dest,
+            packs,
+            {"name": "x"},
+            force=False,
+            dry_run=False,
+            yes=True,
+            init_git=False,
+            render_jobs=1,
+        )
+    assert not dest.exists()
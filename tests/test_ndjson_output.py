@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from project_forge.cli import app
+
+
+def _events(output: str) -> list[dict]:
+    return [json.loads(line) for line in output.splitlines()]
+
+
+def test_new_streams_one_event_per_file_then_a_summary(tmp_path: Path) -> None:
+    dest = tmp_path / "app"
+    result = CliRunner().invoke(
+        app, ["new", "python-cli", str(dest), "--yes", "--output", "ndjson"]
+    )
+    assert result.exit_code == 0, result.output
+    events = _events(result.stdout)
+    files, summary = events[:-1], events[-1]
+    assert {e["event"] for e in files} == {"written"}
+    readme = next(e for e in files if e["path"] == "README.md")
+    body = (dest / "README.md").read_bytes()
+    assert readme["size"] == len(body) and readme["sha256"] == hashlib.sha256(body).hexdigest()
+    assert summary["event"] == "summary" and summary["files"] == summary["written"] == len(files)
+
+    again = CliRunner().invoke(
+        app, ["new", "python-cli", str(dest), "--yes", "--force", "--dry-run", "--output", "ndjson"]
+    )
+    assert {e["event"] for e in _events(again.stdout)[:-1]} == {"planned"}
+
+
+def test_add_reports_written_and_changed_files(tmp_path: Path) -> None:
+    dest = tmp_path / "app"
+    CliRunner().invoke(app, ["new", "python-cli", str(dest), "--yes"])
+    result = CliRunner().invoke(
+        app, ["add", "docker", "python-quality", str(dest), "--output", "ndjson"]
+    )
+    assert result.exit_code == 0, result.output
+    events = _events(result.stdout)
+    assert {(e["event"], e["path"]) for e in events[:-1]} >= {
+        ("written", "Dockerfile"),
+        ("changed", "pyproject.toml"),
+    }
+    assert events[-1]["event"] == "summary" and events[-1]["features"] == [
+        "docker",
+        "python-quality",
+    ]
+
+
+def test_stdout_holds_only_events_with_git_init(tmp_path: Path) -> None:
+    dest = tmp_path / "app"
+    args = ["new", "python-cli", str(dest), "--yes", "--git", "--output", "ndjson"]
+    result = CliRunner().invoke(app, args)
+    assert result.exit_code == 0, result.output
+    assert (dest / ".git").is_dir()
+    events = _events(result.stdout)  # git's "Initialized empty Git repository" is on stderr
+    assert events[-1]["event"] == "summary"
+    assert "Initialized" in result.stderr
+
+
+def test_failure_ends_with_an_error_event(tmp_path: Path) -> None:
+    args = ["new", "no-such-template", str(tmp_path / "app"), "--yes", "--output", "ndjson"]
+    result = CliRunner().invoke(app, args)
+    assert result.exit_code != 0
+    events = _events(result.stdout)
+    assert events[-1]["event"] == "error" and "no-such-template" in events[-1]["error"]
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from project_forge.engine.archive import build_archive, open_archive
+from project_forge.engine.fs import ForgeError
+from project_forge.engine.packs import Pack
+from project_forge.engine.plan import generate
+from project_forge.engine.sink import TarSink, ZipSink, open_sink
+
+
+def _pack(tmp_path: Path) -> Path:
+    root = tmp_path / "pack" / "svc"
+    (root / "src").mkdir(parents=True)
+    (root / "src/app.py.j2").write_text("print('{{ name }}')\n", encoding="utf-8")
+    (root / "logo.png").write_bytes(b"\x89PNG\xff\x00" * 1000)
+    manifest = {
+        "schema_version": 1,
+        "vars": {"name": {"default": "demo"}},
+        "files": [
+            {"src": "src/app.py.j2"},
+            {"src": "logo.png", "dst": "static/logo.png", "mode": "binary"},
+        ],
+    }
+    (root / "forge.json").write_text(json.dumps(manifest), encoding="utf-8")
+    return tmp_path / "pack"
+
+
+class _Pipe(io.RawIOBase):
+    # write-only and unseekable, like stdout piped into another process
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:  # type: ignore[override]
+        self.data += b
+        return len(b)
+
+
+def test_tar_sink_streams_paths_modes_and_state_without_touching_dest(tmp_path: Path) -> None:
+    packs = [Pack(name="p", kind="local", path=_pack(tmp_path))]
+    dest = tmp_path / "proj"
+    pipe = _Pipe()
+    with TarSink(pipe, prefix="proj") as sink:
+        created = generate("svc", dest, packs, {"name": "x"}, False, False, True, False, sink=sink)
+
+    assert not dest.exists() and len(created) == 2
+    with tarfile.open(fileobj=io.BytesIO(bytes(pipe.data)), mode="r:gz") as tar:
+        names = tar.getnames()
+        assert names == [
+            "proj",
+            "proj/src",
+            "proj/src/app.py",
+            "proj/static",
+            "proj/static/logo.png",
+            "proj/.forge",
+            "proj/.forge/state.json",
+        ]
+        assert (
+            tar.getmember("proj/src").mode == 0o755
+            and tar.getmember("proj/src/app.py").mode == 0o644
+        )
+        assert tar.extractfile("proj/src/app.py").read() == b"print('x')\n"
+        logo = tar.extractfile("proj/static/logo.png").read()
+        state = json.loads(tar.extractfile("proj/.forge/state.json").read())
+    assert logo == b"\x89PNG\xff\x00" * 1000
+    assert state["files"]["static/logo.png"]["hash"] == hashlib.sha256(logo).hexdigest()
+
+
+def test_zip_sink_from_a_pack_archive_to_an_unseekable_stream(tmp_path: Path) -> None:
+    out = tmp_path / "p.forgepack"
+    build_archive(_pack(tmp_path), out)
+    packs = [Pack(name="p", kind="archive", path=out, commit=open_archive(out).digest)]
+    pipe = _Pipe()
+    with ZipSink(pipe, prefix="proj") as sink:
+        generate(
+            "svc", tmp_path / "proj", packs, {"name": "x"}, False, False, True, False, sink=sink
+        )
+
+    with zipfile.ZipFile(io.BytesIO(bytes(pipe.data))) as zf:
+        assert zf.read("proj/static/logo.png") == b"\x89PNG\xff\x00" * 1000
+        assert zf.read("proj/src/app.py") == b"print('x')\n"
+        assert zf.getinfo("proj/src/app.py").external_attr >> 16 == 0o100644
+
+
+def test_failed_generation_removes_the_partial_archive(tmp_path: Path) -> None:
+    packs = [Pack(name="p", kind="local", path=_pack(tmp_path))]
+    target = tmp_path / "out.tar.gz"
+    with pytest.raises(ForgeError):
+        with open_sink(str(target), prefix="proj") as sink:
+            generate("nope", tmp_path / "proj", packs, {}, False, False, True, False, sink=sink)
+    assert not target.exists()
+
+
+def test_failed_stream_is_cut_off_without_a_trailer(tmp_path: Path) -> None:
+    pack = _pack(tmp_path)
+    (pack / "svc/src/app.py.j2").write_text("{{ missing }}\n", encoding="utf-8")
+    packs = [Pack(name="p", kind="local", path=pack)]
+    pipe = _Pipe()
+    with pytest.raises(Exception, match="missing"):
+        with ZipSink(pipe, prefix="proj") as sink:
+            generate(
+                "svc", tmp_path / "proj", packs, {"name": "x"}, False, False, True, False, sink=sink
+            )
+    with pytest.raises(zipfile.BadZipFile):
+        zipfile.ZipFile(io.BytesIO(bytes(pipe.data)))
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from project_forge.engine.archive import build_archive, open_archive
+from project_forge.engine.packs import Pack
+from project_forge.engine.plan import find_templates, generate, get_template
+from project_forge.engine.render import render_plan
+
+
+def _pack_dir(tmp_path: Path) -> Path:
+    root = tmp_path / "src-pack" / "templates" / "tpl"
+    root.mkdir(parents=True)
+    (root / "README.md.j2").write_text("# {{ name }}\n", encoding="utf-8")
+    (root / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n\xff\x00")
+    # same bytes as README: stored once
+    (root / "copy.txt").write_text("# {{ name }}\n", encoding="utf-8")
+    manifest = {
+        "schema_version": 1,
+        "vars": {"name": {"default": "demo"}},
+        "files": [
+            {"src": "README.md.j2"},
+            {"src": "logo.png", "mode": "auto"},
+            {"src": "copy.txt"},
+        ],
+    }
+    (root / "forge.json").write_text(json.dumps(manifest), encoding="utf-8")
+    return tmp_path / "src-pack"
+
+
+def test_archive_pack_renders_without_extracting(tmp_path: Path) -> None:
+    out = tmp_path / "p.forgepack"
+    stats = build_archive(_pack_dir(tmp_path), out)
+    assert stats["templates"] == 1 and stats["files"] == 3
+    assert stats["bytes"] == len("# {{ name }}\n") + 10
+
+    packs = [Pack(name="arch", kind="archive", path=out, commit=open_archive(out).digest)]
+    assert [t.name for t in find_templates(packs)] == ["tpl"]
+
+    tpl = get_template("tpl", packs).template()
+    ops = render_plan(tpl, tmp_path / "plan", {"name": "x"})
+    png = next(op for op in ops if op.dst.name == "logo.png")
+    assert isinstance(png.bytes_data, memoryview) and png.src is None
+
+    dest = tmp_path / "proj"
+    generate(
+        "tpl", dest, packs, {"name": "x"}, force=False, dry_run=False, yes=True, init_git=False
+    )
+    assert (dest / "README.md").read_text(encoding="utf-8") == "# x\n"
+    assert (dest / "logo.png").read_bytes() == b"\x89PNG\r\n\x1a\n\xff\x00"
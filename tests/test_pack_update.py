@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from project_forge.engine.fs import ForgeError
+from project_forge.engine.packs import PACKS_LOCK, add_pack, mirror_path, update_packs
+
+GIT = [
+    "git",
+    "-c",
+    "user.name=forge",
+    "-c",
+    "user.email=forge@example.com",
+    "-c",
+    "init.defaultBranch=main",
+]
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        [*GIT, *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def _repo(tmp_path: Path, name: str) -> Path:
+    repo = tmp_path / name
+    tpl = repo / "tpl"
+    tpl.mkdir(parents=True)
+    (tpl / "forge.json").write_text(
+        json.dumps({"schema_version": 1, "files": [{"src": "a.txt"}]}), encoding="utf-8"
+    )
+    (tpl / "a.txt").write_text("v1\n", encoding="utf-8")
+    _git(repo, "init", "-q")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "v1")
+    return repo
+
+
+def test_pack_update_fetches_into_mirror_and_updates_in_place(tmp_path: Path) -> None:
+    r1, r2 = _repo(tmp_path, "one"), _repo(tmp_path, "two")
+    p1 = add_pack(f"file://{r1}", name="one")
+    p2 = add_pack(f"file://{r2}", name="two")
+    assert mirror_path(f"file://{r1}").joinpath("HEAD").exists()
+    keep = p1.path / "tpl" / "forge.json"
+    inode = keep.stat().st_ino
+
+    (r1 / "tpl" / "a.txt").write_text("v2\n", encoding="utf-8")
+    _git(r1, "commit", "-q", "-am", "v2")
+    head = _git(r1, "rev-parse", "HEAD")
+
+    results = {r.name: r for r in update_packs()}
+    assert results["one"].changed and results["one"].new_commit == head
+    assert not results["two"].changed
+    assert (p1.path / "tpl" / "a.txt").read_text(encoding="utf-8") == "v2\n"
+    assert keep.stat().st_ino == inode  # untouched files stay in place
+    assert (p2.path / "tpl" / "a.txt").read_text(encoding="utf-8") == "v1\n"
+
+    lock = json.loads(PACKS_LOCK.read_text(encoding="utf-8"))
+    assert {p["name"]: p["commit"] for p in lock["packs"]}["one"] == head
+
+    with pytest.raises(ForgeError):
+        update_packs(["missing"])
+
+
+def test_pack_update_rejects_a_named_local_pack(tmp_path: Path) -> None:
+    local = tmp_path / "mylocal"
+    local.mkdir()
+    add_pack(str(local), name="mylocal")
+
+    with pytest.raises(ForgeError, match="not a git pack"):
+        update_packs(["mylocal"])
+    assert "mylocal" not in {r.name for r in update_packs()}
+
+
+def test_identical_pack_files_share_one_blob_and_gc_frees_unused(tmp_path: Path) -> None:
+    from project_forge.engine.blobs import BLOB_DIR, gc
+    from project_forge.engine.packs import list_packs, remove_pack
+
+    r1, r2 = _repo(tmp_path, "fork-a"), _repo(tmp_path, "fork-b")
+    a = add_pack(f"file://{r1}", name="fork-a")
+    b = add_pack(f"file://{r2}", name="fork-b")
+    fa, fb = a.path / "tpl" / "a.txt", b.path / "tpl" / "a.txt"
+    assert fa.stat().st_ino == fb.stat().st_ino  # one blob, two trees
+
+    # updating one fork must not leak into the other
+    (r1 / "tpl" / "a.txt").write_text("changed\n", encoding="utf-8")
+    _git(r1, "commit", "-q", "-am", "change")
+    update_packs(["fork-a"])
+    assert fa.read_text(encoding="utf-8") == "changed\n"
+    assert fb.read_text(encoding="utf-8") == "v1\n"
+
+    remove_pack("fork-a")
+    report = gc(list_packs(tmp_path))
+    assert report.trees == 1 and report.mirrors == 1 and report.blobs >= 1
+    assert not a.path.exists()
+    assert fb.read_text(encoding="utf-8") == "v1\n"
+    assert all(p.stat().st_nlink > 1 for p in BLOB_DIR.glob("??/*"))
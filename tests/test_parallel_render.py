@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from project_forge.engine.render import Template, render_plan
+
+
+def _template(tmp_path: Path, bodies: dict[str, str | bytes]) -> Template:
+    root = tmp_path / "tpl"
+    root.mkdir()
+    files = []
+    for name, body in bodies.items():
+        if isinstance(body, bytes):
+            (root / name).write_bytes(body)
+            files.append({"src": name, "mode": "auto"})
+        else:
+            (root / name).write_text(body, encoding="utf-8")
+            files.append({"src": name})
+    manifest = {"schema_version": 1, "files": files}
+    (root / "forge.json").write_text(json.dumps(manifest), encoding="utf-8")
+    return Template(name="tpl", root=root, manifest=manifest)
+
+
+def test_pool_matches_serial_output_and_order(tmp_path: Path) -> None:
+    bodies: dict[str, str | bytes] = {
+        f"f{i:02d}.txt.j2": "{%% for n in range(%d) %%}{{ name }}{{ n }} {%% endfor %%}\n" % i
+        for i in range(30)
+    }
+    bodies["logo.bin"] = b"\xff\x00\xfe"
+    tpl = _template(tmp_path, bodies)
+
+    serial = render_plan(tpl, tmp_path / "out", {"name": "x"}, jobs=1)
+    pooled = render_plan(tpl, tmp_path / "out", {"name": "x"}, jobs=2)
+    assert [op.dst for op in pooled] == [op.dst for op in serial]
+    assert [op.text_data for op in pooled] == [op.text_data for op in serial]
+    assert pooled[-1].src == serial[-1].src and pooled[-1].is_binary
+
+
+def test_pool_raises_the_first_error_in_plan_order(tmp_path: Path) -> None:
+    bodies: dict[str, str | bytes] = {f"f{i:02d}.txt": "ok {{ name }}\n" for i in range(20)}
+    bodies["f05.txt"] = "{{ missing_one }}"
+    bodies["f12.txt"] = "{{ missing_two }}"
+    tpl = _template(tmp_path, bodies)
+
+    with pytest.raises(Exception) as serial:
+        render_plan(tpl, tmp_path / "out", {"name": "x"}, jobs=1)
+    with pytest.raises(Exception) as pooled:
+        render_plan(tpl, tmp_path / "out", {"name": "x"}, jobs=3)
+    assert type(pooled.value) is type(serial.value)
+    assert str(pooled.value) == str(serial.value) and "missing_one" in str(pooled.value)
@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from project_forge.engine.fs import safe_join, ForgeError
+from project_forge.engine.fs import join_under, safe_join, ForgeError
 
 def test_safe_join_blocks_traversal(tmp_path: Path):
     root = tmp_path / "root"
@@ -16,3 +16,13 @@ def test_safe_join_allows_normal_paths(tmp_path: Path):
     root.mkdir()
     p = safe_join(root, "a/b/c.txt")
     assert str(p).endswith("a/b/c.txt")
+
+def test_join_under_is_lexical(tmp_path: Path):
+    root = tmp_path.resolve()
+    assert join_under(root, "a/./b/../c.txt") == root / "a/c.txt"
+    for bad in ("../x", "a/../../x", "/etc/passwd"):
+        try:
+            join_under(root, bad)
+            assert False, "expected ForgeError"
+        except ForgeError:
+            pass
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+import socket
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from project_forge.engine.packs import add_pack
+from project_forge.engine.serve import ForgeService, start, stop
+
+
+def _builtin_root() -> Path:
+    return Path(__file__).resolve().parents[1] / "src/project_forge/templates_builtin"
+
+
+def _ask(sock_path: Path, *requests: dict) -> list[dict]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(str(sock_path))
+        f = s.makefile("rwb")
+        out = []
+        for req in requests:
+            f.write(json.dumps(req).encode("utf-8") + b"\n")
+            f.flush()
+            out.append(json.loads(f.readline()))
+        return out
+
+
+def test_serve_over_unix_socket_and_http(tmp_path: Path) -> None:
+    service = ForgeService(_builtin_root(), workers=2)
+    sock = tmp_path / "forge.sock"
+    servers = start(service, socket_path=sock, port=0)
+    try:
+        listed, created, bad = _ask(
+            sock,
+            {"id": 1, "op": "list"},
+            {
+                "id": 2,
+                "op": "generate",
+                "template": "python-fastapi",
+                "dest": str(tmp_path / "api"),
+            },
+            {"id": 3, "op": "generate", "template": "nope", "dest": str(tmp_path / "x")},
+        )
+        assert listed["ok"] and "python-fastapi" in {t["name"] for t in listed["result"]}
+        assert created["ok"] and created["id"] == 2 and (tmp_path / "api/pyproject.toml").exists()
+        assert not bad["ok"] and "not found" in bad["error"]
+
+        http = servers[1]
+        assert http.token_path == tmp_path / "forge-serve.token"
+        assert http.token_path.stat().st_mode & 0o777 == 0o600
+        headers = {
+            "Authorization": f"Bearer {http.token_path.read_text().strip()}",
+            "Content-Type": "application/json",
+        }
+        body = json.dumps({"features": ["docker"], "dest": str(tmp_path / "api")}).encode("utf-8")
+        url = f"http://127.0.0.1:{http.server_address[1]}/add"
+        with urllib.request.urlopen(
+            urllib.request.Request(url, data=body, headers=headers)
+        ) as resp:
+            assert json.loads(resp.read())["result"]["applied"] == ["docker"]
+        assert (tmp_path / "api/Dockerfile").exists()
+
+        # what a web page (or a DNS-rebound name) could send is refused before any work
+        for bad, status in (
+            ({"Authorization": "Bearer nope"}, 401),
+            ({"Origin": "https://evil.example"}, 403),
+            ({"Host": "evil.example"}, 403),
+            ({"Content-Type": "text/plain"}, 415),
+        ):
+            with pytest.raises(urllib.error.HTTPError) as err:
+                urllib.request.urlopen(
+                    urllib.request.Request(url, data=body, headers={**headers, **bad})
+                )
+            assert err.value.code == status
+
+        # packs.json changes are picked up without a restart
+        tpl = tmp_path / "mypack" / "fresh"
+        tpl.mkdir(parents=True)
+        (tpl / "forge.json").write_text('{"schema_version": 1, "files": []}', encoding="utf-8")
+        add_pack(str(tmp_path / "mypack"), name="fresh-pack")
+        (listed,) = _ask(sock, {"op": "list"})
+        assert "fresh" in {t["name"] for t in listed["result"]}
+    finally:
+        stop(servers)
+        service.close()
+    assert not sock.exists() and not http.token_path.exists()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from project_forge.engine.render import (
+    Template,
+    iter_plan,
+    load_manifest,
+    render_plan,
+    apply_plan,
+    write_op,
+)
+
+
+def _template(root: Path) -> Template:
+    root.mkdir()
+    (root / "big.txt.j2").write_text(
+        "{% for i in range(n) %}line {{ i }}\n{% endfor %}", encoding="utf-8"
+    )
+    (root / "small.txt.j2").write_text("hi {{ name }}\n", encoding="utf-8")
+    (root / "logo.bin").write_bytes(bytes(range(256)) * 4)
+    manifest = {
+        "schema_version": 1,
+        "files": [
+            {"src": "big.txt.j2", "mode": "text"},
+            {"src": "small.txt.j2", "mode": "text"},
+            {"src": "logo.bin", "mode": "auto"},
+        ],
+    }
+    (root / "forge.json").write_text(json.dumps(manifest), encoding="utf-8")
+    return Template(name="t", root=root, manifest=load_manifest(root))
+
+
+def test_stream_matches_materialized_plan(tmp_path: Path) -> None:
+    tpl = _template(tmp_path / "tpl")
+    ctx = {"n": 1000, "name": "x"}
+
+    apply_plan(render_plan(tpl, tmp_path / "a", ctx), force=False)
+
+    for op in iter_plan(tpl, tmp_path / "b", ctx):
+        if op.is_binary:
+            assert op.src is not None and op.bytes_data is None
+        else:
+            # even a tiny template is streamed: its output size is unknown until rendered
+            assert op.text_data is None and op.chunks is not None
+        write_op(op, force=False)
+
+    for name in ("big.txt", "small.txt", "logo.bin"):
+        assert (tmp_path / "a" / name).read_bytes() == (tmp_path / "b" / name).read_bytes()
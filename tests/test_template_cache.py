@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+from jinja2 import Environment, StrictUndefined
+from jinja2.utils import LRUCache
+
+from project_forge.engine import render
+from project_forge.engine.cache import TemplateCache
+
+
+def _env(cache: TemplateCache) -> Environment:
+    return Environment(undefined=StrictUndefined, keep_trailing_newline=True, bytecode_cache=cache)
+
+
+def test_warm_cache_skips_compilation(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(render, "_COMPILED", LRUCache(8))
+    cache = TemplateCache(tmp_path)
+    src = "hello {{ name }}\n"
+
+    assert render.compile_template(_env(cache), src).render(name="a") == "hello a\n"
+    assert list(tmp_path.glob("*.jbc"))
+
+    # A fresh process: nothing in memory, so the code must come from disk.
+    monkeypatch.setattr(render, "_COMPILED", LRUCache(8))
+    e = _env(cache)
+
+    def boom(*args, **kwargs):
+        raise AssertionError("template was recompiled")
+
+    monkeypatch.setattr(e, "compile", boom)
+    assert render.compile_template(e, src).render(name="b") == "hello b\n"
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(render, "_COMPILED", LRUCache(8))
+    cache = TemplateCache(tmp_path)
+    e = _env(cache)
+    render.compile_template(e, "{{ a }}")
+    (first,) = tmp_path.glob("*.jbc")
+    os.utime(first, (0, 0))
+
+    cache.max_bytes = first.stat().st_size * 3
+    for name in "bcd":
+        render.compile_template(e, "{{ %s }}" % name)
+
+    remaining = list(tmp_path.glob("*.jbc"))
+    assert 0 < len(remaining) < 4
+    assert first not in remaining
+
+
+def test_eviction_skips_entries_removed_by_another_process(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(render, "_COMPILED", LRUCache(8))
+    cache = TemplateCache(tmp_path)
+    e = _env(cache)
+    for name in "abcd":
+        render.compile_template(e, "{{ %s }}" % name)
+    listed = cache._entries()
+    os.unlink(listed[0].path)  # a concurrent evict got there first
+    monkeypatch.setattr(cache, "_entries", lambda: listed)
+    cache.max_bytes = 1
+    cache.evict()
+    assert not list(tmp_path.glob("*.jbc"))
+    assert not list(tmp_path.glob(".*.tmp"))
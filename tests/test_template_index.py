@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from project_forge.engine import index
+from project_forge.engine.packs import Pack, index_path
+from project_forge.engine.plan import find_templates, get_template
+
+
+def _template(root: Path, name: str, prompt: str = "Name") -> None:
+    (root / name).mkdir(parents=True)
+    manifest = {"schema_version": 1, "vars": {"x": {"prompt": prompt}}, "files": []}
+    (root / name / "forge.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+
+def test_index_is_persisted_and_invalidated(tmp_path: Path) -> None:
+    pack = Pack(name="idx-test", kind="local", path=tmp_path)
+    _template(tmp_path, "alpha")
+
+    assert [t.name for t in find_templates([pack])] == ["alpha"]
+    assert index_path("idx-test").exists()
+
+    # A new template changes the pack directory mtime and shows up.
+    _template(tmp_path, "beta")
+    os.utime(tmp_path, ns=(0, tmp_path.stat().st_mtime_ns + 1_000_000))
+    index.forget()  # a new command
+    assert [t.name for t in find_templates([pack])] == ["alpha", "beta"]
+
+
+def test_manifest_added_to_an_existing_folder_shows_up(tmp_path: Path) -> None:
+    pack = Pack(name="idx-late", kind="local", path=tmp_path)
+    _template(tmp_path, "alpha")
+    (tmp_path / "beta").mkdir()
+    assert [t.name for t in find_templates([pack])] == ["alpha"]
+
+    (tmp_path / "beta" / "forge.json").write_text(json.dumps({"schema_version": 1, "files": []}))
+    beta = tmp_path / "beta"
+    os.utime(beta, ns=(0, beta.stat().st_mtime_ns + 1_000_000))
+    index.forget()
+    assert [t.name for t in find_templates([pack])] == ["alpha", "beta"]
+
+
+def test_pack_is_checked_once_per_command(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    pack = Pack(name="idx-once", kind="local", path=tmp_path)
+    _template(tmp_path, "alpha")
+    (tmp_path / "broken").mkdir()
+    (tmp_path / "broken" / "forge.json").write_text("{", encoding="utf-8")
+    index.forget()
+    calls = []
+    real = index._signature
+    monkeypatch.setattr(index, "_signature", lambda p: calls.append(p) or real(p))
+
+    assert [t.name for t in find_templates([pack])] == ["alpha", "broken"]
+    lt = get_template("alpha", [pack])
+    lt.template()
+    get_template("alpha", [pack]).manifest
+    assert len(calls) == 1
+    # manifests are only parsed and validated when a template is used
+    with pytest.raises(ValueError):
+        get_template("broken", [pack]).manifest
+
+
+def test_manifest_edits_are_picked_up(tmp_path: Path) -> None:
+    pack = Pack(name="idx-edit", kind="local", path=tmp_path)
+    _template(tmp_path, "alpha")
+    assert get_template("alpha", [pack]).manifest["vars"]["x"]["prompt"] == "Name"
+
+    mpath = tmp_path / "alpha" / "forge.json"
+    mpath.write_text(
+        json.dumps({"schema_version": 1, "vars": {"x": {"prompt": "New"}}, "files": []})
+    )
+    os.utime(mpath, ns=(0, mpath.stat().st_mtime_ns + 1_000_000))
+    assert get_template("alpha", [pack]).manifest["vars"]["x"]["prompt"] == "New"
+
+
+def test_later_packs_win(tmp_path: Path) -> None:
+    a, b = tmp_path / "a", tmp_path / "b"
+    _template(a, "same")
+    _template(b, "same")
+    packs = [Pack(name="idx-a", kind="local", path=a), Pack(name="idx-b", kind="local", path=b)]
+    assert get_template("same", packs).root == b / "same"
+    assert find_templates(packs)[0].root == b / "same"
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from project_forge.engine import trace
+from project_forge.engine.packs import list_packs
+from project_forge.engine.plan import generate
+
+
+def _builtin_root() -> Path:
+    return Path(__file__).resolve().parents[1] / "src/project_forge/templates_builtin"
+
+
+def test_recorder_collects_phases_and_files(tmp_path: Path) -> None:
+    packs = list_packs(_builtin_root())
+    ctx = {"project_name": "svc", "module": "example.com/svc"}
+    with trace.Recorder() as rec:
+        created = generate(
+            "go-api",
+            tmp_path / "svc",
+            packs,
+            ctx,
+            force=False,
+            dry_run=False,
+            yes=True,
+            init_git=False,
+        )
+
+    phases = dict(rec.phases())
+    assert {"resolve template", "render", "write"} <= set(phases)
+    files = rec.files()
+    assert set(files) == set(created)
+    assert all(f["write"] > 0 for f in files.values())
+
+    out = tmp_path / "trace.json"
+    rec.write_chrome_trace(out)
+    events = json.loads(out.read_text())["traceEvents"]
+    assert events and all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+
+
+def _traced(dest: Path, **kwargs) -> tuple[trace.Recorder, list[str]]:
+    packs = list_packs(_builtin_root())
+    ctx = {"project_name": "svc", "module": "example.com/svc"}
+    with trace.Recorder() as rec:
+        created = generate(
+            "go-api",
+            dest,
+            packs,
+            ctx,
+            force=False,
+            dry_run=False,
+            yes=True,
+            init_git=False,
+            **kwargs,
+        )
+    return rec, created
+
+
+def test_stream_mode_splits_render_and_write(tmp_path: Path) -> None:
+    rec, created = _traced(tmp_path / "svc", stream=True)
+    phases = dict(rec.phases())
+    assert {"render", "write"} <= set(phases) and phases["render"] > 0
+    files = rec.files()
+    assert set(files) == set(created)
+    readme = files[str((tmp_path / "svc" / "README.md").resolve())]
+    assert readme["render"] > 0 and readme["write"] > 0
+
+
+def test_pool_span_is_a_step_not_a_file(tmp_path: Path) -> None:
+    rec, created = _traced(tmp_path / "svc", render_jobs=2)
+    assert [name for name, _ in rec.phases("step")] == ["render pool"]
+    assert set(rec.files()) == set(created)
+
+
+def test_listeners_are_removed() -> None:
+    seen: list[trace.Span] = []
+    trace.add_listener(seen.append)
+    with trace.span("outer"):
+        pass
+    trace.remove_listener(seen.append)
+    with trace.span("ignored"):
+        pass
+    assert [s.name for s in seen] == ["outer"]
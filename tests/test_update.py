@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from project_forge.engine.packs import Pack
+from project_forge.engine.plan import generate, update
+from project_forge.engine.state import read_state
+
+
+def _pack(tmp_path: Path) -> list[Pack]:
+    root = tmp_path / "pack" / "tpl"
+    root.mkdir(parents=True)
+    (root / "README.md.j2").write_text("# {{ name }}\n", encoding="utf-8")
+    (root / "static.txt").write_text("static\n", encoding="utf-8")
+    (root / "main.py.j2").write_text("print('{{ name }}')\n", encoding="utf-8")
+    manifest = {
+        "schema_version": 1,
+        "vars": {"name": {"default": "demo"}},
+        "files": [{"src": "README.md.j2"}, {"src": "static.txt"}, {"src": "main.py.j2"}],
+    }
+    (root / "forge.json").write_text(json.dumps(manifest), encoding="utf-8")
+    return [Pack(name="upd", kind="local", path=tmp_path / "pack")]
+
+
+def test_update_rewrites_only_changed_files(tmp_path: Path) -> None:
+    packs = _pack(tmp_path)
+    dest = tmp_path / "proj"
+    generate(
+        "tpl", dest, packs, {"name": "demo"}, force=False, dry_run=False, yes=True, init_git=False
+    )
+    state = read_state(dest)
+    assert state is not None and set(state.files) == {"README.md", "static.txt", "main.py"}
+
+    static_mtime = (dest / "static.txt").stat().st_mtime_ns
+    (dest / "main.py").write_text("print('edited by hand')\n", encoding="utf-8")
+
+    report = update(dest, packs, {"name": "renamed"})
+
+    assert report.updated == ["README.md"]
+    assert report.identical == ["static.txt"]
+    assert report.conflicts == ["main.py"]
+    assert (dest / "README.md").read_text() == "# renamed\n"
+    assert (dest / "main.py").read_text() == "print('edited by hand')\n"
+    assert (dest / "static.txt").stat().st_mtime_ns == static_mtime
+
+    # nothing changed since: no file is even re-rendered
+    report = update(dest, packs)
+    assert sorted(report.unchanged) == ["README.md", "static.txt"]
+    assert report.conflicts == ["main.py"]
+
+    report = update(dest, packs, force=True)
+    assert report.updated == ["main.py"]
+    assert (dest / "main.py").read_text() == "print('renamed')\n"